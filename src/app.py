@@ -3,75 +3,9 @@ from __future__ import annotations
 
 import sys
 import argparse
+import itertools
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Tuple
-
-import yaml
-from PySide6 import QtGui, QtWidgets
-from ui import UIApp
-from export import Exporter
-from pdfio import PdfIO
-from registry import PluginRegistry
-from state import Store
-
-# Welcome picker dialog
-from welcome import WelcomeDialog
-
-
-# -------------------------
-# Config helpers
-# -------------------------
-
-_DEFAULT_CONFIG: Dict[str, Any] = {
-    "pdf": {"cache_pages": 12, "workers": 2},
-    "export": {"filename_template": "{tag}_p{page}.json", "pretty": True},
-    "aliases": {},
-}
-
-# High-DPI rounding policy (Qt6+). Avoid deprecated AA_* attributes.
-if hasattr(QtGui.QGuiApplication, "setHighDpiScaleFactorRoundingPolicy"):
-    try:
-        QtGui.QGuiApplication.setHighDpiScaleFactorRoundingPolicy(
-            QtGui.QGuiApplication.HighDpiScaleFactorRoundingPolicy.PassThrough
-        )
-    except Exception:
-        pass
-
-
-def load_config(path: Optional[str]) -> Dict[str, Any]:
-    """Load YAML config; fall back to defaults if missing/corrupt."""
-    if not path:
-        return _DEFAULT_CONFIG.copy()
-    p = Path(path).expanduser()
-    if not p.exists():
-        return _DEFAULT_CONFIG.copy()
-    try:
-        with p.open("r", encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
-        # shallow-merge defaults
-        out = _DEFAULT_CONFIG.copy()
-        for k, v in data.items():
-            if isinstance(v, dict) and isinstance(out.get(k), dict):
-                tmp = out[k].copy()
-                tmp.update(v)
-                out[k] = tmp
-            else:
-                out[k] = v
-        return out
-    except Exception:
-        return _DEFAULT_CONFIG.copy()
-
-
-def _apply_aliases_from_config(registry: PluginRegistry, aliases: Dict[str, str]) -> None:
-    """Best-effort alias registration based on whatever API the registry exposes."""
-    for src, dst in (aliases or {}).items():
-        if hasattr(registry, "add_alias"):
-            registry.add_alias(src, dst)                # type: ignore[attr-defined]
-        elif hasattr(registry, "register_alias"):
-            registry.register_alias(src, dst)           # type: ignore[attr-defined]
-        elif hasattr(registry, "alias"):
-            registry.alias(src, dst)                    # type: ignore[attr-defined]
-        # else: silently ignore
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 
 
 # -------------------------
@@ -86,12 +20,29 @@ def main(argv: Optional[List[str]] = None) -> int:
                         help="When target is a folder, include PDFs in subfolders")
     args = parser.parse_args(argv)
 
+    # Heavy imports (Qt, YAML, PDF backends) are deferred until we know we're launching: --help stays instant
+    from PySide6 import QtCore, QtGui, QtWidgets
+    from app_support import (
+        WriteJob,
+        WriteSignals,
+        apply_aliases_from_config,
+        gather_from_target,
+        install_autosave_timer,
+        load_config,
+        relative_parent,
+    )
+    from export import Exporter
+    from pdfio import PdfIO
+    from registry import PluginRegistry
+    from state import Store
+    from ui import UIApp
+
     # Load config
     config = load_config(args.config)
 
     # Registry (loads built-ins + aliases)
     registry = PluginRegistry()
-    _apply_aliases_from_config(registry, config.get("aliases", {}))
+    apply_aliases_from_config(registry, config.get("aliases", {}))
 
     # Store + PdfIO
     store = Store(registry=registry)
@@ -100,6 +51,15 @@ def main(argv: Optional[List[str]] = None) -> int:
         workers=int(config["pdf"].get("workers", 2)),
     )
 
+    # High-DPI rounding policy (Qt6+), set before the QApplication exists. Avoid deprecated AA_* attributes.
+    if hasattr(QtGui.QGuiApplication, "setHighDpiScaleFactorRoundingPolicy"):
+        try:
+            QtGui.QGuiApplication.setHighDpiScaleFactorRoundingPolicy(
+                QtGui.QGuiApplication.HighDpiScaleFactorRoundingPolicy.PassThrough
+            )
+        except Exception:
+            pass
+
     # UI (Qt app first; we may open a Welcome dialog)
     qt = QtWidgets.QApplication(sys.argv)
 
@@ -108,6 +68,7 @@ def main(argv: Optional[List[str]] = None) -> int:
     ui.registry = registry
     ui.pdf = pdfio
     ui.canvas.pdf = pdfio
+    qt.aboutToQuit.connect(pdfio.shutdown)  # stop the page-prefetch workers
 
     # Exporter + config
     exporter = Exporter(registry)
@@ -115,32 +76,18 @@ def main(argv: Optional[List[str]] = None) -> int:
     pretty = bool(config["export"].get("pretty", True))
 
     # ---- Determine playlist + roots (CLI target OR Welcome dialog) ----
-    def _gather_from_target(target: str, recursive: bool) -> List[str]:
-        p = Path(target).expanduser().resolve()
-        if p.is_file() and p.suffix.lower() == ".pdf":
-            return [str(p)]
-        if p.is_dir():
-            if recursive:
-                pdfs = sorted(p.rglob("*.pdf"), key=lambda x: x.as_posix().lower())
-            else:
-                pdfs = sorted(
-                    [c for c in p.iterdir() if c.is_file() and c.suffix.lower() == ".pdf"],
-                    key=lambda x: x.as_posix().lower()
-                )
-            return [str(x) for x in pdfs]
-        return []
-
-    pdf_list: List[str] = []
+    pdf_list: Iterable[str]
     playlist_root: Path
 
     if args.target:
-        tgt = Path(args.target).expanduser().resolve()
-        pdf_list = _gather_from_target(args.target, args.recursive)
-        if not pdf_list:
+        pdfs, playlist_root = gather_from_target(args.target, args.recursive)
+        first = next(pdfs, None)  # a folder is only scanned as far as the UI pulls
+        if first is None:
             QtWidgets.QMessageBox.warning(None, "No PDFs", "No PDF found at the given target.")
             return 1
-        playlist_root = tgt if tgt.is_dir() else tgt.parent
+        pdf_list = itertools.chain((first,), pdfs)
     else:
+        from welcome import WelcomeDialog  # only the no-target path shows the picker
         dlg = WelcomeDialog(parent=None)
         if dlg.exec() != QtWidgets.QDialog.Accepted:
             return 0  # user canceled
@@ -149,42 +96,140 @@ def main(argv: Optional[List[str]] = None) -> int:
             QtWidgets.QMessageBox.warning(None, "No PDFs", "No PDF found in the selected folder.")
             return 1
         playlist_root = folder
-        pdf_list = [str(p) for p in pdfs]
+        pdf_list = (str(p) for p in pdfs)
 
     # Export root: sibling folder next to playlist_root
     export_root = playlist_root.parent / f"{playlist_root.name}_json"
 
+    # ---- Background writer: one thread keeps writes ordered; drained on quit ----
+    write_pool = QtCore.QThreadPool(ui)
+    write_pool.setMaxThreadCount(1)
+    write_signals = WriteSignals(ui)
+    write_signals.message.connect(ui.toast)
+    qt.aboutToQuit.connect(write_pool.waitForDone)
+
+    def _is_current(rec: Optional[Tuple[Any, ...]]) -> bool:
+        """True if `rec` = (store, data_revision, ...) still describes the live store's export data."""
+        return rec is not None and rec[0] is ui.store and rec[1] == ui.store.data_revision
+
+    # ---- Export cache: reuse build/validate (and encoded bytes) while the exported data is unchanged ----
+    # (data_revision, not revision: page turns and zoom don't touch what build() reads)
+    last_built: Optional[Tuple[Store, int, Dict[str, Any], bool, List[str], Dict[bool, bytes]]] = None
+
+    def _build_current() -> Tuple[Dict[str, Any], bool, List[str], Dict[bool, bytes]]:
+        nonlocal last_built
+        store = ui.store
+        if _is_current(last_built):
+            return last_built[2:]
+        data = exporter.build(store.state)
+        ok, errors = exporter.validate(data)
+        last_built = (store, store.data_revision, data, ok, errors, {})
+        return data, ok, errors, last_built[5]
+
+    # filename_tmpl is fixed for the session, so the export data and page ({page}) key the name
+    last_name: Optional[Tuple[Store, int, int, str]] = None
+
+    def _export_basename() -> str:
+        """Basename proposed by the exporter's filename template (cached per data revision and page)."""
+        nonlocal last_name
+        store = ui.store
+        page = store.state.pdf.page
+        if _is_current(last_name) and last_name[2] == page:
+            return last_name[3]
+        name = Path(exporter.filename(store.state, filename_tmpl)).name
+        last_name = (store, store.data_revision, page, name)
+        return name
+
+    # ---- Playlist-relative folders (memoized per PDF) + directories already created ----
+    rel_map: Dict[str, Path] = {}
+    made_dirs: set[Path] = set()
+
+    def _rel_parent() -> Path:
+        """Relative folder of the current PDF within playlist_root (flattened if outside)."""
+        path = ui.store.state.pdf.path or ""
+        rel = rel_map.get(path)
+        if rel is None:
+            rel = rel_map[path] = relative_parent(path, playlist_root)
+        return rel
+
+    def _ensure_dir(d: Path) -> None:
+        if d not in made_dirs:
+            d.mkdir(parents=True, exist_ok=True)
+            made_dirs.add(d)
+
+    # ---- Write coalescing: the data revision last queued for an explicit save ----
+    # Ctrl+S, "next PDF" and autosave all consult it, so unchanged data is written once per path.
+    last_saved: Optional[Tuple[Store, int, Path]] = None
+
+    def _forget_failed(path: str) -> None:
+        nonlocal last_saved
+        if last_saved is not None and str(last_saved[2]) == path:
+            last_saved = None  # let the next save retry
+
+    write_signals.failed.connect(_forget_failed)
+
     # ---- Immediate write export (writes to sibling export_root) ----
     def _write_current() -> None:
         """Build + validate + write JSON for current UI state immediately under export_root, preserving subfolders."""
-        # Build/validate
-        data = exporter.build(ui.store.state)
-        ok, errors = exporter.validate(data)
+        nonlocal last_saved
+        # Build/validate (cached per data revision)
+        data, ok, errors, encoded = _build_current()
         if not ok and errors:
             ui.toast(f"Validation errors: {len(errors)}", ttl=3.0)
 
         # Proposed filename from exporter (we'll only keep its basename)
-        out_name = Path(exporter.filename(ui.store.state, filename_tmpl)).name
-
-        # Compute relative path of the current PDF within playlist_root
-        cur_pdf = Path(ui.store.state.pdf.path or "")
-        try:
-            rel_parent = cur_pdf.parent.relative_to(playlist_root)
-        except Exception:
-            # If PDF not under playlist_root, flatten
-            rel_parent = Path("")
+        out_name = _export_basename()
 
         # Final destination under the sibling export_root
-        final_dir = (export_root / rel_parent)
-        final_dir.mkdir(parents=True, exist_ok=True)
+        final_dir = (export_root / _rel_parent())
+        _ensure_dir(final_dir)
         final_path = final_dir / out_name
 
-        # Dump + write
-        text = exporter.dumps(data, pretty=pretty)
-        final_path.write_text(text, encoding="utf-8")
-
-        ui.toast(f"Saved → {final_path.relative_to(export_root)}")
-        print(f"[export] wrote: {final_path}")
+        # Same data already written (or queued) to this path: e.g. Ctrl+S then "next PDF"
+        done_msg = f"Saved → {final_path.relative_to(export_root)}"
+        if _is_current(last_saved) and last_saved[2] == final_path:
+            ui.toast(done_msg)
+            return
+
+        # Serialize + write off the GUI thread; the toast arrives when the file is on disk
+        write_pool.start(WriteJob(
+            exporter, final_path, data, encoded, pretty=pretty, durable=True, signals=write_signals,
+            done_msg=done_msg,
+        ))
+        last_saved = (ui.store, ui.store.data_revision, final_path)
+
+    # ---- Autosave: compact JSON while dirty + valid; skipped when nothing changed ----
+    autosave_cfg = config.get("autosave", {})
+    autosave_root = export_root / str(autosave_cfg.get("dir", ".acu_autosave"))
+    last_autosave: Optional[Tuple[Store, int]] = None
+
+    def _autosave_tick() -> None:
+        nonlocal last_autosave
+        store = ui.store
+        if not store.state.dirty or not store.state.pdf.path:
+            return
+        if _is_current(last_autosave) or _is_current(last_saved):
+            return  # nothing changed since the last autosave / explicit save
+        rev = store.data_revision
+        data, ok, _, encoded = _build_current()
+        if not ok:
+            return
+        out_name = Path(_export_basename()).stem + ".autosave.json"
+        out_dir = autosave_root / _rel_parent()
+        try:
+            _ensure_dir(out_dir)
+        except OSError as e:
+            print(f"[autosave] failed: {e}")
+            return
+        # no fsync: autosave is best-effort, but the rename keeps the previous copy intact
+        write_pool.start(WriteJob(
+            exporter, out_dir / out_name, data, encoded, pretty=False, durable=False, signals=write_signals,
+            atomic=True,
+        ))
+        last_autosave = (store, rev)
+
+    if autosave_cfg.get("enabled", True):
+        install_autosave_timer(ui, float(autosave_cfg.get("seconds", 30)), _autosave_tick)
 
     # Hook: save before switching PDFs
     ui._on_before_next_pdf = _write_current
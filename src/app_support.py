@@ -0,0 +1,215 @@
+# src/app_support.py
+"""
+Helpers behind app.main(): config loading, playlist scanning and the
+background export writer. Kept out of app.py so main() stays a thin
+wiring function and each helper has a single implementation.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from types import MappingProxyType
+from typing import Optional, List, Dict, Any, Callable, Iterator, Mapping, Tuple
+
+import yaml
+from PySide6 import QtCore
+
+from export import Exporter
+from registry import PluginRegistry
+
+try:
+    _YAML_LOADER = yaml.CSafeLoader  # libyaml, when PyYAML was built with it
+except AttributeError:
+    _YAML_LOADER = yaml.SafeLoader
+
+
+# -------------------------
+# Config
+# -------------------------
+
+# Read-only template: returned as-is when there is no user config.
+DEFAULT_CONFIG: Mapping[str, Any] = MappingProxyType({
+    "pdf": MappingProxyType({"cache_pages": 12, "workers": 2}),
+    "export": MappingProxyType({"filename_template": "{tag}_p{page}.json", "pretty": True}),
+    "autosave": MappingProxyType({"enabled": True, "seconds": 30, "dir": ".acu_autosave"}),
+    "aliases": MappingProxyType({}),
+})
+
+
+def load_config(path: Optional[str]) -> Mapping[str, Any]:
+    """Load YAML (or .json) config; fall back to (read-only) defaults if missing/corrupt."""
+    if not path:
+        return DEFAULT_CONFIG
+    p = Path(path).expanduser()
+    if not p.exists():
+        return DEFAULT_CONFIG
+    try:
+        with p.open("r", encoding="utf-8") as f:
+            if p.suffix.lower() == ".json":
+                data = json.load(f) or {}
+            else:
+                data = yaml.load(f, Loader=_YAML_LOADER) or {}
+        # shallow-merge defaults: only the sections the user overrides are copied
+        out = dict(DEFAULT_CONFIG)
+        for k, v in data.items():
+            base = out.get(k)
+            out[k] = {**base, **v} if isinstance(v, dict) and isinstance(base, Mapping) else v
+        return out
+    except Exception:
+        return DEFAULT_CONFIG
+
+
+def apply_aliases_from_config(registry: PluginRegistry, aliases: Mapping[str, str]) -> None:
+    """Register config aliases (token -> type_id) in one pass; unknown targets are reported, not fatal."""
+    if not aliases:
+        return
+    try:
+        registry.add_aliases(dict(aliases))
+    except ValueError as e:
+        print(f"[config] {e}")
+
+
+# -------------------------
+# Playlist
+# -------------------------
+
+def iter_pdfs(root: Path, recursive: bool) -> Iterator[str]:
+    """
+    Yield PDF paths under `root` (subfolders too if `recursive`) in case-insensitive
+    full-path order. Folders are listed one at a time, only when the walk reaches them.
+    """
+    def _walk(folder: str) -> Iterator[str]:
+        entries: List[Tuple[str, str, bool]] = []
+        try:
+            with os.scandir(folder) as it:
+                for entry in it:
+                    name = entry.name.lower()
+                    if name.endswith(".pdf") and entry.is_file():
+                        entries.append((name, entry.path, False))
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        # "name/" sorts where the folder's contents sort in the full path
+                        entries.append((name + "/", entry.path, True))
+        except OSError:
+            return  # unreadable folder: skip, like rglob did
+        entries.sort()
+        for _, path, is_dir in entries:
+            if is_dir:
+                yield from _walk(path)
+            else:
+                yield path
+
+    return _walk(str(root))
+
+
+def scan_pdfs(root: Path, recursive: bool) -> List[str]:
+    """All of iter_pdfs() as a list."""
+    return list(iter_pdfs(root, recursive))
+
+
+def gather_from_target(target: str, recursive: bool) -> Tuple[Iterator[str], Path]:
+    """
+    PDFs named by a CLI target (the file itself, or the PDFs inside a folder)
+    plus the playlist root. The target is resolved and stat'ed only once; a
+    folder is scanned lazily as the playlist is consumed.
+    """
+    p = Path(target).expanduser().resolve()
+    if p.is_dir():
+        return iter_pdfs(p, recursive), p
+    if p.suffix.lower() == ".pdf" and p.is_file():
+        return iter([str(p)]), p.parent
+    return iter(()), p.parent
+
+
+def relative_parent(pdf_path: str, root: Path) -> Path:
+    """Folder of `pdf_path` relative to `root`; flattened to '' when outside it."""
+    try:
+        return Path(pdf_path).parent.relative_to(root)
+    except ValueError:
+        return Path("")
+
+
+# -------------------------
+# Export writer
+# -------------------------
+
+# Buffer size for export writes: one syscall for typical exports.
+_WRITE_BUFFER = 256 * 1024
+
+
+def write_bytes(path: Path, payload: bytes, *, durable: bool) -> None:
+    """Write already-encoded JSON to `path` in one call; `durable` also fsyncs."""
+    with open(path, "wb", buffering=_WRITE_BUFFER) as fp:
+        fp.write(payload)
+        fp.flush()
+        if durable:
+            os.fsync(fp.fileno())
+
+
+def write_bytes_atomic(path: Path, payload: bytes) -> None:
+    """Write to a hidden temp file beside `path`, then rename over it: readers never see a torn file."""
+    tmp = path.with_name(f".{path.name}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    os.replace(tmp, path)
+
+
+class WriteSignals(QtCore.QObject):
+    """Lives on the GUI thread; worker emits are delivered as queued calls."""
+    message = QtCore.Signal(str)
+    failed = QtCore.Signal(str)  # path of a write that did not land
+
+
+class WriteJob(QtCore.QRunnable):
+    """
+    Serialize + write one export off the GUI thread (data must not be mutated meanwhile).
+    `encoded` maps pretty -> bytes for this exact `data`; it is filled on first use so
+    a later write of the same revision skips serialization and the UTF-8 encode.
+    `atomic` writes via temp file + rename instead (no fsync; used for autosave).
+    """
+
+    def __init__(self, exporter: Exporter, path: Path, data: Dict[str, Any], encoded: Dict[bool, bytes],
+                 *, pretty: bool, durable: bool, signals: WriteSignals, done_msg: Optional[str] = None,
+                 atomic: bool = False):
+        super().__init__()
+        self._exporter = exporter
+        self._path = path
+        self._data = data
+        self._encoded = encoded
+        self._pretty = pretty
+        self._durable = durable
+        self._atomic = atomic
+        self._signals = signals
+        self._done_msg = done_msg
+
+    def run(self) -> None:
+        try:
+            payload = self._encoded.get(self._pretty)
+            if payload is None:
+                payload = self._encoded[self._pretty] = self._exporter.dumpb(self._data, pretty=self._pretty)
+            if self._atomic:
+                write_bytes_atomic(self._path, payload)
+            else:
+                write_bytes(self._path, payload, durable=self._durable)
+        except Exception as e:
+            print(f"[export] failed: {self._path}: {e}")
+            self._signals.message.emit(f"Save failed: {e}")
+            self._signals.failed.emit(str(self._path))
+            return
+        print(f"[export] wrote: {self._path}")
+        if self._done_msg:
+            self._signals.message.emit(self._done_msg)
+
+
+def install_autosave_timer(parent: QtCore.QObject, seconds: float, tick: Callable[[], None]) -> QtCore.QTimer:
+    """Call `tick` every `seconds` on the GUI thread; the timer is owned by `parent`."""
+    timer = QtCore.QTimer(parent)
+    timer.setInterval(max(1000, int(seconds * 1000)))
+    timer.timeout.connect(tick)
+    timer.start()
+    return timer
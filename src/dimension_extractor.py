@@ -1,12 +1,22 @@
 # src/dimension_extractor_api.py
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Optional, Tuple, Dict
+from typing import Any, Callable, List, Optional, Tuple, Dict
+
+import math
+import os
+from collections import OrderedDict
 
 import numpy as np
 import pdfplumber
 import re
 
+try:
+    from numba import njit  # type: ignore
+    _HAS_NUMBA = True
+except Exception:
+    _HAS_NUMBA = False
+
 # ---------- Public datatypes ----------
 
 BBoxPT = Tuple[float, float, float, float]  # (x0, top, x1, bottom) in PDF points (top-left origin)
@@ -31,12 +41,27 @@ class PageAnalysis:
 
 # ---------- Internals (private) ----------
 
-NumberBox = Tuple[float, float, float, float, str]  # (x0, top, x1, bottom, text)
+@dataclass(frozen=True)
+class _Tokens:
+    """Numeric words of a page as structure-of-arrays (PDF points, top-left origin)."""
+    coords: np.ndarray        # (N, 4) float64: x0, top, x1, bottom (read-only, cached)
+    texts: Tuple[str, ...]
+
+_DIGIT_RE = re.compile(r"\d")
 
 def _is_number_like(txt: str) -> bool:
-    return bool(re.search(r"\d", txt.strip()))
+    return _DIGIT_RE.search(txt) is not None
 
 def _reverse_digits_value(text: str) -> Optional[int]:
+    if text.isascii():  # the usual case: accumulate the reversed value directly, no temporaries
+        v, p = 0, 1
+        for ch in text:
+            c = ord(ch)
+            if 48 <= c <= 57:
+                v += (c - 48) * p
+                p *= 10
+        return v if p > 1 else None
+    # other scripts: str.isdigit also admits e.g. superscripts, which int() rejects
     digits = "".join(ch for ch in text if ch.isdigit())
     if not digits:
         return None
@@ -46,12 +71,69 @@ def _reverse_digits_value(text: str) -> Optional[int]:
         return None
 
 def _render_gray(page: pdfplumber.page.Page, dpi: int) -> tuple[np.ndarray, float, int]:
-    img = page.to_image(resolution=dpi).original.convert("L")
-    gray = np.array(img)
+    img = page.to_image(resolution=dpi).original
+    if img.mode != "L":  # skip the extra full-image pass when the backend already gave grayscale
+        img = img.convert("L")
+    # no copy for an "L" image (read-only is fine: the band scan never writes); a fixed
+    # uint8 dtype also keeps the compiled band kernel to a single specialization
+    gray = np.asarray(img, dtype=np.uint8)
     Hpx = gray.shape[0]
     scale = dpi / 72.0  # px per pt
     return gray, scale, Hpx
 
+def _band_scan(gray: np.ndarray, y0: int, y1: int, thr: int, stride: int, stop_len: int) -> Tuple[int, int]:
+    """
+    (start, length) of the first longest run of white rows in gray[y0:y1], start relative
+    to y0 (-1 if none). One pass; each row stops at its first non-white pixel, and the
+    scan stops at the first run reaching `stop_len` (0 = never): longer would be capped anyway.
+    Only used compiled (numba); the NumPy path below is the fallback.
+    """
+    W = gray.shape[1]
+    best_start, best_len = -1, 0
+    cur_start, cur_len = 0, 0
+    for y in range(y0, y1):
+        white = True
+        for x in range(0, W, stride):
+            if gray[y, x] < thr:
+                white = False
+                break
+        if white:
+            if cur_len == 0:
+                cur_start = y - y0
+            cur_len += 1
+            if stop_len and cur_len >= stop_len:
+                return cur_start, cur_len
+        else:
+            if cur_len > best_len:
+                best_start, best_len = cur_start, cur_len
+            cur_len = 0
+    if cur_len > best_len:
+        best_start, best_len = cur_start, cur_len
+    return best_start, best_len
+
+if _HAS_NUMBA:
+    _band_scan = njit(cache=True, boundscheck=False)(_band_scan)
+
+def _band_scan_numpy(
+    gray: np.ndarray, y0: int, y1: int, white_threshold: int, col_stride: int, stop_len: int
+) -> Tuple[int, int]:
+    """NumPy fallback for _band_scan (same contract)."""
+    # “fully white”: row is white if all pixels >= threshold, i.e. its darkest pixel is
+    # (one reduction pass, no H x W boolean temporary). col_stride > 1 samples every
+    # n-th column only: fewer bytes read, but ink thinner than the stride can be missed.
+    row_white = gray[y0:y1, ::col_stride].min(axis=1) >= white_threshold
+
+    # longest run of white rows: +1/-1 edges of the padded mask mark run starts/ends
+    edges = np.diff(np.concatenate(([False], row_white, [False])).view(np.int8))
+    starts = np.flatnonzero(edges == 1)
+    if starts.size == 0:
+        return -1, 0
+    lengths = np.flatnonzero(edges == -1) - starts
+    capped = np.flatnonzero(lengths >= stop_len) if stop_len else lengths[:0]
+    # earliest run reaching the cap, else the first of the longest runs
+    k = int(capped[0]) if capped.size else int(lengths.argmax())
+    return int(starts[k]), int(lengths[k])
+
 def _find_white_band_px(
     gray: np.ndarray,
     lower_frac: float,
@@ -59,40 +141,74 @@ def _find_white_band_px(
     min_height_px: int,
     max_height_frac: float,
     white_threshold: int,
+    col_stride: int = 1,
 ) -> Optional[Tuple[int, int]]:
     H, _ = gray.shape
     y0, y1 = int(H * lower_frac), int(H * upper_frac)
     if y1 <= y0:
         return None
-    # “fully white”: row is white if all pixels >= threshold
-    row_white = (gray[y0:y1] >= white_threshold).all(axis=1)
-
-    best_len = 0
-    best_start = None
-    cur_len = 0
-    cur_start = 0
-    for i, ok in enumerate(row_white):
-        if ok:
-            if cur_len == 0:
-                cur_start = i
-            cur_len += 1
-        else:
-            if cur_len > best_len:
-                best_len, best_start = cur_len, cur_start
-            cur_len = 0
-    if cur_len > best_len:
-        best_len, best_start = cur_len, cur_start
-
-    if best_start is None or best_len < min_height_px:
+    max_len = int(H * max_height_frac)
+    # any run this long is reported capped to max_len, so the scan can stop there
+    stop_len = max(max_len, min_height_px) if max_len > 0 else 0
+    scan = _band_scan if _HAS_NUMBA else _band_scan_numpy
+    best_start, best_len = scan(gray, y0, y1, white_threshold, max(1, col_stride), stop_len)
+    if best_start < 0 or best_len < min_height_px:
         return None
 
-    max_len = int(H * max_height_frac)
     best_len = min(best_len, max_len)
 
     y_upper = y0 + best_start
     y_lower = y_upper + best_len
     return (y_upper, y_lower)
 
+# Default raster resolution for the white-band scan (1 px = 1 pt)
+_BAND_DPI = 72
+
+# Rendered rasters + tokens per (path, mtime, page, band_dpi): re-analyzing a page is free
+_PAGE_CACHE_SIZE = 32
+_PageData = Tuple[_Tokens, Tuple[np.ndarray, float, int]]
+_page_cache: "OrderedDict[Tuple[str, int, int, int], _PageData]" = OrderedDict()
+
+def _mtime_ns(pdf_path: str) -> int:
+    try:
+        return os.stat(pdf_path).st_mtime_ns
+    except OSError:
+        return 0  # let pdfplumber.open report the real error
+
+def _extract_page(page: pdfplumber.page.Page, band_dpi: int) -> _PageData:
+    """(numeric tokens, band raster) for one open page."""
+    words = [w for w in (page.extract_words() or []) if _is_number_like(w.get("text", ""))]
+    coords = np.array(
+        [(w["x0"], w["top"], w["x1"], w["bottom"]) for w in words], dtype=np.float64
+    ).reshape(-1, 4)
+    coords.flags.writeable = False
+    return _Tokens(coords, tuple(w["text"] for w in words)), _render_gray(page, band_dpi)
+
+def _cached_page(
+    key: Tuple[str, int, int, int], open_pdf: Callable[[], "pdfplumber.PDF"], close: bool
+) -> Optional[_PageData]:
+    """LRU lookup; on a miss read page key[2] from `open_pdf()` (None if it doesn't exist)."""
+    hit = _page_cache.get(key)
+    if hit is not None:
+        _page_cache.move_to_end(key)
+        return hit
+    pdf = open_pdf()
+    try:
+        if key[2] >= len(pdf.pages):
+            return None
+        data = _extract_page(pdf.pages[key[2]], key[3])
+    finally:
+        if close:
+            pdf.close()
+    _page_cache[key] = data
+    if len(_page_cache) > _PAGE_CACHE_SIZE:
+        _page_cache.popitem(last=False)
+    return data
+
+def clear_page_cache() -> None:
+    """Drop cached page rasters/tokens (e.g. to release memory when closing a folder)."""
+    _page_cache.clear()
+
 # ---------- Public API ----------
 
 def analyze_page(
@@ -100,156 +216,163 @@ def analyze_page(
     page_index: int = 0,
     *,
     dpi: int = 150,
+    band_dpi: int = _BAND_DPI,
     # white-band search window (fractions of page height)
     search_lower_frac: float = 0.20,
     search_upper_frac: float = 0.80,
     min_band_height_px: int = 15,
     max_band_height_frac: float = 0.15,
     white_threshold: int = 255,
+    band_col_stride: int = 1,
 ) -> PageAnalysis:
     """
     Analyze a page and return white band + dimension boxes, all in PDF points (top-left origin).
 
     Call this from the UI (no drawing inside). The UI can map PDF points to screen via PdfIO.
+
+    Pixel-valued knobs (min_band_height_px, token grouping tolerance) are expressed at `dpi`;
+    the band raster itself is rendered at the (cheaper) `band_dpi`, since it only needs rows.
+    For many calls on one file, PageAnalyzer keeps the PDF open between them.
+    """
+    key = (pdf_path, _mtime_ns(pdf_path), page_index, band_dpi)
+    loaded = _cached_page(key, lambda: pdfplumber.open(pdf_path), close=True)
+    return _analyze_loaded(
+        loaded,
+        dpi=dpi,
+        band_dpi=band_dpi,
+        search_lower_frac=search_lower_frac,
+        search_upper_frac=search_upper_frac,
+        min_band_height_px=min_band_height_px,
+        max_band_height_frac=max_band_height_frac,
+        white_threshold=white_threshold,
+        band_col_stride=band_col_stride,
+    )
+
+
+class PageAnalyzer:
     """
-    with pdfplumber.open(pdf_path) as pdf:
-        if page_index >= len(pdf.pages):
-            return PageAnalysis(white_band=None, dimensions=[])
-
-        page = pdf.pages[page_index]
-
-        # 1) Extract numeric tokens (already in PDF points)
-        words = page.extract_words() or []
-        tokens: List[NumberBox] = [
-            (w["x0"], w["top"], w["x1"], w["bottom"], w["text"])
-            for w in words if _is_number_like(w.get("text", ""))
-        ]
-
-        # 2) Detect white band in pixels, convert to PDF points (no mirroring!)
-        gray, scale, Hpx = _render_gray(page, dpi)
-        band_px = _find_white_band_px(
-            gray,
-            lower_frac=search_lower_frac,
-            upper_frac=search_upper_frac,
-            min_height_px=min_band_height_px,
-            max_height_frac=max_band_height_frac,
-            white_threshold=white_threshold,
+    analyze_page() over one PDF handle kept open across calls (no re-parse per page).
+
+        with PageAnalyzer(path) as an:
+            first = an.analyze(0, dpi=150)
+    """
+
+    def __init__(self, pdf_path: str):
+        self.pdf_path = pdf_path
+        self._mtime_ns = _mtime_ns(pdf_path)
+        self._pdf = pdfplumber.open(pdf_path)
+
+    def analyze(self, page_index: int = 0, **opts: Any) -> PageAnalysis:
+        """Same options as analyze_page()."""
+        band_dpi = opts.get("band_dpi", _BAND_DPI)
+        key = (self.pdf_path, self._mtime_ns, page_index, band_dpi)
+        return _analyze_loaded(_cached_page(key, lambda: self._pdf, close=False), **opts)
+
+    def close(self) -> None:
+        self._pdf.close()
+
+    def __enter__(self) -> "PageAnalyzer":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def _analyze_loaded(
+    loaded: Optional[_PageData],
+    *,
+    dpi: int = 150,
+    band_dpi: int = _BAND_DPI,
+    search_lower_frac: float = 0.20,
+    search_upper_frac: float = 0.80,
+    min_band_height_px: int = 15,
+    max_band_height_frac: float = 0.15,
+    white_threshold: int = 255,
+    band_col_stride: int = 1,
+) -> PageAnalysis:
+    if loaded is None:
+        return PageAnalysis(white_band=None, dimensions=[])
+    # 1) Numeric tokens (already in PDF points)
+    tokens, raster = loaded
+
+    # 2) Detect white band in pixels, convert to PDF points (no mirroring!)
+    gray, band_scale, Hpx = raster
+    scale = dpi / 72.0  # px per pt at the reference dpi
+    band_px = _find_white_band_px(
+        gray,
+        lower_frac=search_lower_frac,
+        upper_frac=search_upper_frac,
+        min_height_px=math.ceil(min_band_height_px * band_dpi / dpi),
+        max_height_frac=max_band_height_frac,
+        white_threshold=white_threshold,
+        col_stride=band_col_stride,
+    )
+    white_band: Optional[WhiteBand] = None
+    if band_px:
+        y_upper_px, y_lower_px = band_px
+        # px -> pt (top-left origin in pdfplumber)
+        y_upper_pt = y_upper_px / band_scale
+        y_lower_pt = y_lower_px / band_scale
+        white_band = WhiteBand(
+            y_top_pt=y_upper_pt,
+            y_bottom_pt=y_lower_pt,
+            height_pt=abs(y_lower_pt - y_upper_pt),
         )
-        white_band: Optional[WhiteBand] = None
-        if band_px:
-            y_upper_px, y_lower_px = band_px
-            # px -> pt (top-left origin in pdfplumber)
-            y_upper_pt = y_upper_px / scale
-            y_lower_pt = y_lower_px / scale
-            white_band = WhiteBand(
-                y_top_pt=y_upper_pt,
-                y_bottom_pt=y_lower_pt,
-                height_pt=abs(y_lower_pt - y_upper_pt),
-            )
-
-        # 3) Classify tokens relative to band & select the four dimension fields
-        def center_pt(box: NumberBox) -> tuple[float, float]:
-            x0, t, x1, b, _ = box
-            return ((x0 + x1) / 2.0, (t + b) / 2.0)
-
-        dims: Dict[str, DimensionBox] = {}
-        if tokens:
-            # Split tokens using band (if present). Top-left origin: smaller y = higher
-            above: List[NumberBox] = []
-            below: List[NumberBox] = []
-            if white_band:
-                for box in tokens:
-                    _, cy = center_pt(box)
-                    if cy < white_band.y_top_pt:
-                        above.append(box)
-                    elif cy > white_band.y_bottom_pt:
-                        below.append(box)
-            else:
-                # No band → treat all as "below" so we still try to pick widths
-                below = tokens[:]
-
-            # Heuristics (preserving your earlier logic):
-            # - HEIGHTS from "below" group (leftmost two by y)
-            if below:
-                below_sorted_x = sorted(below, key=lambda b: (b[0], b[1]))
-                # Cabinet height: first by top (smallest top) within leftmost x-group
-                leftmost_x = below_sorted_x[0][0]
-                group = [b for b in below if abs(b[0] - leftmost_x) <= 2.0]  # small x tolerance in pts
-                group_sorted_y = sorted(group, key=lambda b: b[1])
-                if group_sorted_y:
-                    b0 = group_sorted_y[0]
-                    dims["cabinet_height"] = DimensionBox(
-                        kind="cabinet_height",
-                        bbox_pt=b0[:4],
-                        text_raw=b0[4],
-                        value=_reverse_digits_value(b0[4]),
-                    )
-                    if len(group_sorted_y) >= 2:
-                        b1 = group_sorted_y[1]
-                        dims["height_base_only"] = DimensionBox(
-                            kind="height_base_only",
-                            bbox_pt=b1[:4],
-                            text_raw=b1[4],
-                            value=_reverse_digits_value(b1[4]),
-                        )
-
-            # - WIDTHS from "above" group (leftmost is width_with_base; nearest in same-x group is cabinet_width)
-                        # --- WIDTHS from "above" tokens using adjacent X-groups ---
-            if above:
-                # helper: cluster by x-center with ~2px tolerance
-                def group_by_xcenter(boxes: List[NumberBox], tol_px: float = 2.0):
-                    tol_pt = tol_px / max(1e-6, scale)  # px -> pt
-                    items = [(*b, ((b[0] + b[2]) / 2.0, (b[1] + b[3]) / 2.0)) for b in boxes]  # append (cx,cy)
-                    items.sort(key=lambda it: it[-1][0])  # by cx
-                    groups: List[List[tuple]] = []
-                    cur: List[tuple] = []
-                    cur_cx: Optional[float] = None
-                    for it in items:
-                        cx, cy = it[-1]
-                        if cur and cur_cx is not None and abs(cx - cur_cx) > tol_pt:
-                            groups.append(cur)
-                            cur = [it]
-                            cur_cx = cx
-                        else:
-                            cur.append(it)
-                            cur_cx = cx if cur_cx is None else (cur_cx + cx) / 2.0
-                    if cur:
-                        groups.append(cur)
-                    return groups
-
-                groups = group_by_xcenter(above)
-                if groups:
-                    # width_with_base = leftmost token in the leftmost group (by x, then by y)
-                    left_group = groups[0]
-                    left_group_sorted = sorted(left_group, key=lambda it: (it[0], it[1]))  # by x0 then top
-                    wwb_it = left_group_sorted[0]
-                    wwb_box = wwb_it[:5]  # NumberBox
-                    _, _, _, _, _ = wwb_box
-                    cx_w, cy_w = wwb_it[-1]
-
-                    dims["width_with_base"] = DimensionBox(
-                        kind="width_with_base",
-                        bbox_pt=wwb_box[:4],
-                        text_raw=wwb_box[4],
-                        value=_reverse_digits_value(wwb_box[4]),
-                    )
-
-                    # cabinet_width = token in the NEXT x-group (adjacent to the right) with closest Y to wwb
-                    if len(groups) >= 2:
-                        next_group = groups[1]
-                        # pick by minimal |Δy|
-                        def dy(it): return abs(it[-1][1] - cy_w)
-                        cabw_it = min(next_group, key=dy)
-                        cabw_box = cabw_it[:5]
-                        dims["cabinet_width"] = DimensionBox(
-                            kind="cabinet_width",
-                            bbox_pt=cabw_box[:4],
-                            text_raw=cabw_box[4],
-                            value=_reverse_digits_value(cabw_box[4]),
-                        )
-
-
-        return PageAnalysis(
-            white_band=white_band,
-            dimensions=list(dims.values())
+
+    # 3) Classify tokens relative to band & select the four dimension fields
+    dims: Dict[str, DimensionBox] = {}
+
+    def pick(kind: str, i: int) -> None:
+        text = tokens.texts[i]
+        dims[kind] = DimensionBox(
+            kind=kind,
+            bbox_pt=tuple(tokens.coords[i].tolist()),
+            text_raw=text,
+            value=_reverse_digits_value(text),
         )
+
+    coords = tokens.coords
+    if len(coords):
+        x0, top = coords[:, 0], coords[:, 1]
+        cx = (coords[:, 0] + coords[:, 2]) / 2.0
+        cy = (coords[:, 1] + coords[:, 3]) / 2.0
+
+        # Split tokens using band (if present). Top-left origin: smaller y = higher
+        if white_band:
+            above = np.flatnonzero(cy < white_band.y_top_pt)
+            below = np.flatnonzero(cy > white_band.y_bottom_pt)
+        else:
+            # No band → treat all as "below" so we still try to pick widths
+            above = np.empty(0, dtype=np.intp)
+            below = np.arange(len(coords))
+
+        # Heuristics (preserving your earlier logic):
+        # - HEIGHTS from "below" group: leftmost x-group (small x tolerance in pts), first two by top
+        if below.size:
+            group = below[np.abs(x0[below] - x0[below].min()) <= 2.0]
+            group = group[np.argsort(top[group], kind="stable")]
+            pick("cabinet_height", group[0])
+            if group.size >= 2:
+                pick("height_base_only", group[1])
+
+        # - WIDTHS from "above" tokens using adjacent x-center groups (~2px tolerance)
+        if above.size:
+            tol_pt = 2.0 / max(1e-6, scale)  # px -> pt
+            by_cx = above[np.argsort(cx[above], kind="stable")]
+            # a new group starts wherever the gap to the previous center exceeds the tolerance
+            groups = np.split(by_cx, np.flatnonzero(np.diff(cx[by_cx]) > tol_pt) + 1)
+
+            # width_with_base = leftmost token in the leftmost group (by x, then by y)
+            left = groups[0]
+            wwb = left[np.lexsort((top[left], x0[left]))[0]]
+            pick("width_with_base", wwb)
+
+            # cabinet_width = token in the NEXT x-group (adjacent to the right) with closest Y to wwb
+            if len(groups) >= 2:
+                nxt = groups[1]
+                pick("cabinet_width", nxt[np.argmin(np.abs(cy[nxt] - cy[wwb]))])
+
+    return PageAnalysis(
+        white_band=white_band,
+        dimensions=list(dims.values())
+    )
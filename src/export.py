@@ -1,15 +1,24 @@
 # src/export.py
 from __future__ import annotations
 
+import io
 import json
 import os
+import weakref
 from dataclasses import asdict
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
 
 from state import AppState
 from registry import PluginRegistry
 
+try:
+    import orjson  # type: ignore
+    _HAS_ORJSON = True
+except Exception:
+    _HAS_ORJSON = False
+
 
 # ---------------------------
 # Public Facade
@@ -25,9 +34,8 @@ class Exporter:
         data = xp.build(state)               # dict
         ok, errors = xp.validate(data)       # strict on required fields
         if ok:
-            text = xp.dumps(data, pretty=True)
             out_path = xp.filename(state, "{tag}_p{page}.json")
-            Path(out_path).write_text(text, encoding="utf-8")
+            xp.dump(out_path, data, pretty=True)   # or an open binary file
     """
 
     def __init__(self, registry: PluginRegistry):
@@ -41,9 +49,42 @@ class Exporter:
     def validate(self, data: Dict[str, Any]) -> Tuple[bool, List[str]]:
         return _validate_export_dict(data, self.registry)
 
-    # ---- JSON text ----
+    # ---- JSON text (orjson when installed, else the stdlib) ----
+    # Both give the same text for export data: str keys, finite numbers. Outside that
+    # they differ (orjson writes NaN/inf as null and 1e16 as "1e16", and rejects non-str
+    # keys), so non-finite numbers are refused at input (normalize_number, section lengths)
+    # and the stdlib path raises on them (allow_nan=False) rather than writing invalid JSON.
     def dumps(self, data: Dict[str, Any], pretty: bool = True) -> str:
-        return json.dumps(data, indent=2, ensure_ascii=False) if pretty else json.dumps(data, separators=(",", ":"))
+        if _HAS_ORJSON:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0).decode("utf-8")
+        if pretty:
+            return json.dumps(data, indent=2, ensure_ascii=False, allow_nan=False)
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+
+    # ---- JSON as UTF-8 bytes, ready for a binary write (native with orjson) ----
+    def dumpb(self, data: Dict[str, Any], pretty: bool = True) -> bytes:
+        if _HAS_ORJSON:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+        return self.dumps(data, pretty=pretty).encode("utf-8")
+
+    # ---- JSON streamed into a binary file or a path (no intermediate str) ----
+    def dump(self, fp: Union[BinaryIO, str, os.PathLike], data: Dict[str, Any], pretty: bool = True) -> None:
+        if isinstance(fp, (str, os.PathLike)):
+            with open(fp, "wb", buffering=256 * 1024) as f:
+                self.dump(f, data, pretty=pretty)
+            return
+        if _HAS_ORJSON:
+            fp.write(self.dumpb(data, pretty=pretty))
+            return
+        text_fp = io.TextIOWrapper(fp, encoding="utf-8", newline="")
+        try:
+            if pretty:
+                json.dump(data, text_fp, indent=2, ensure_ascii=False, allow_nan=False)
+            else:
+                json.dump(data, text_fp, ensure_ascii=False, separators=(",", ":"), allow_nan=False)
+            text_fp.flush()
+        finally:
+            text_fp.detach()  # leave fp open for the caller
 
     # ---- Filename from template ----
     def filename(self, state: AppState, template: str = "{tag}_p{page}.json") -> str:
@@ -102,11 +143,11 @@ def _build_export_dict(state: AppState, registry: PluginRegistry) -> Dict[str, A
             type_key = spec.get("type_key", comp.type_id)
             comp_label = spec.get("label", comp.label or comp.type_id)
 
+            spec_fields = spec.get("fields", {})
             field_block: Dict[str, Any] = {}
-            for fname in comp.fields.keys():
-                fdef = spec.get("fields", {}).get(fname, {})
-                field_label = fdef.get("label") or _humanize_field(fname)
-                value = comp.fields.get(fname, None)
+            for fname, value in comp.fields.items():
+                fdef = spec_fields.get(fname)
+                field_label = (fdef.get("label") if fdef else None) or _humanize_field(fname)
                 field_block[field_label] = value
 
             comp_obj = {"Label": comp_label, type_key: field_block}
@@ -162,6 +203,7 @@ def _unit_properties_from_state(state: AppState) -> Dict[str, Any]:
     return fields
 
 
+@lru_cache(maxsize=512)
 def _humanize_field(fname: str) -> str:
     """
     Convert 'face_and_bypass_damper' → 'Face and bypass damper'
@@ -186,8 +228,11 @@ def _humanize_field(fname: str) -> str:
     return s[0].upper() + s[1:]
 
 
+_FILENAME_DEL = str.maketrans("", "", r'\/:*?"<>|')
+
+
 def _sanitize_filename(s: str) -> str:
-    return "".join(c for c in s if c not in r'\/:*?"<>|').strip() or "Unit"
+    return s.translate(_FILENAME_DEL).strip() or "Unit"
 
 
 # ---------------------------
@@ -217,6 +262,10 @@ def _validate_export_dict(data: Dict[str, Any], registry: PluginRegistry) -> Tup
         errors.append("Invalid: Section length should be a list")
         return False, errors
 
+    # Registry lookups hoisted out of the component loop (spec tables persist per registry)
+    known_type_keys = set(registry.type_keys())
+    spec_checks = _SPEC_CHECKS.setdefault(registry, {})
+
     # Validate each component by spec
     for si, sec in enumerate(sections, start=1):
         comps = sec.get("Components", [])
@@ -225,32 +274,29 @@ def _validate_export_dict(data: Dict[str, Any], registry: PluginRegistry) -> Tup
         for ci, comp_obj in enumerate(comps, start=1):
             label = comp_obj.get("Label")
             # Detect type_key by finding key that matches a registry spec
-            type_key, fields = _detect_type_block(comp_obj, registry)
+            type_key, fields = _detect_type_block(comp_obj, registry, known_type_keys)
             if not type_key:
                 errors.append(f"Section {si} Component {ci}: Could not determine component type for label '{label}'")
                 continue
-            # Map back to type_id
-            type_id = registry.type_id_from_type_key(type_key) or type_key
-            spec = registry.get_spec(type_id)
+            # Map back to type_id; the spec's labels/enum sets are resolved once per registry
+            checks = spec_checks.get(type_key)
+            if checks is None:
+                type_id = registry.type_id_from_type_key(type_key) or type_key
+                checks = spec_checks[type_key] = _build_spec_checks(registry.get_spec(type_id))
+            required_labels, field_defs = checks
 
             # Required fields
-            req = spec.get("required_fields", [])
-            for fname in req:
-                fdef = spec.get("fields", {}).get(fname, {})
-                field_label = fdef.get("label") or _humanize_field(fname)
+            for field_label in required_labels:
                 if field_label not in fields or fields[field_label] is None:
                     errors.append(
                         f"Section {si} Component {ci} ({label}): missing required '{field_label}'"
                     )
             # Enum/Bool sanity
-            for fname, fdef in spec.get("fields", {}).items():
-                field_label = fdef.get("label") or _humanize_field(fname)
+            for field_label, ftype, fdef, canon_vals in field_defs:
                 val = fields.get(field_label, None)
                 if val is None:
                     continue  # optional or not set
-                ftype = fdef.get("type", "enum")
                 if ftype == "enum":
-                    canon_vals = set(fdef.get("map", {}).values())
                     if canon_vals and val not in canon_vals:
                         errors.append(
                             f"Section {si} Component {ci} ({label}): invalid value for '{field_label}': {val}"
@@ -281,26 +327,55 @@ def _validate_export_dict(data: Dict[str, Any], registry: PluginRegistry) -> Tup
     return (len(errors) == 0), errors
 
 
-def _detect_type_block(comp_obj: Dict[str, Any], registry: PluginRegistry) -> Tuple[Optional[str], Dict[str, Any]]:
+# Per-registry validation tables: {registry: {type_key: (required labels, field checks)}}.
+# Specs are fixed once a registry is built (add_aliases only touches aliases).
+_FieldCheck = Tuple[str, str, Dict[str, Any], Optional[frozenset]]  # (label, type, fdef, enum values)
+_SPEC_CHECKS: "weakref.WeakKeyDictionary[PluginRegistry, Dict[str, Tuple[List[str], List[_FieldCheck]]]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _build_spec_checks(spec: Dict[str, Any]) -> Tuple[List[str], List[_FieldCheck]]:
+    """Field labels, types and canonical enum values of one spec, resolved once."""
+    labels: Dict[str, str] = {}
+    checks: List[_FieldCheck] = []
+    for fname, fdef in spec.get("fields", {}).items():
+        label = labels[fname] = fdef.get("label") or _humanize_field(fname)
+        ftype = fdef.get("type", "enum")
+        canon = frozenset(fdef.get("map", {}).values()) if ftype == "enum" else None
+        checks.append((label, ftype, fdef, canon))
+    required = [labels.get(fname) or _humanize_field(fname) for fname in spec.get("required_fields", [])]
+    return required, checks
+
+
+_RESERVED_KEYS = frozenset({"Label"})
+
+
+def _detect_type_block(
+    comp_obj: Dict[str, Any], registry: PluginRegistry, known_type_keys: Optional[set] = None
+) -> Tuple[Optional[str], Dict[str, Any]]:
     """
     Given a component object like:
         {"Label":"Gas Heater", "GasHeater": {...}}
     Return ("GasHeater", {...})
 
-    If multiple type-like keys exist, prefer the one that matches registry.type_key values.
+    If multiple type-like keys exist, prefer the one that matches registry.type_key values
+    (`known_type_keys` lets a caller pass that set in once for many components).
     """
-    reserved = {"Label"}
-    candidates = [k for k in comp_obj.keys() if k not in reserved and isinstance(comp_obj[k], dict)]
-    if not candidates:
-        return None, {}
-    # Prefer known type_keys
-    known_type_keys = set(registry.type_keys())
-    for k in candidates:
+    if known_type_keys is None:
+        known_type_keys = set(registry.type_keys())
+    first: Optional[str] = None
+    for k, v in comp_obj.items():
+        if k in _RESERVED_KEYS or not isinstance(v, dict):
+            continue
         if k in known_type_keys:
-            return k, comp_obj[k]
+            return k, v  # prefer known type_keys
+        if first is None:
+            first = k
     # otherwise fallback to the first
-    k = candidates[0]
-    return k, comp_obj[k]
+    if first is None:
+        return None, {}
+    return first, comp_obj[first]
 
 
 # ---------------------------
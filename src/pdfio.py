@@ -1,34 +1,152 @@
 # src/pdfio.py
 from __future__ import annotations
 
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Dict, Tuple, Optional
+import multiprocessing
+import os
+import sys
 import threading
+import numpy as np
 import fitz  # PyMuPDF
 from PySide6 import QtCore, QtGui   # <-- add QtCore
 
+@dataclass
+class _Entry:
+    """
+    A rendered page. `qimg` paints straight out of `pixels` (no detach copy), so the
+    entry owns that buffer: keep the entry, not just the QImage, for as long as it is shown.
+    """
+    pixels: np.ndarray  # (h, w, 4) uint8 in Format_RGB32 layout
+    w: int
+    h: int
+    stride: int
+    dpr: float
+    qimg: QtGui.QImage
+    logical: Tuple[int, int]  # (w, h) / dpr: the size the image paints at, in widget pixels
+
+def _rgb32(samples: bytes, w: int, h: int, stride: int) -> np.ndarray:
+    """
+    Repack PyMuPDF's RGB888 rows as Format_RGB32 (0xffRRGGBB words), the raster engine's
+    native blit format: the 24->32 bit expansion happens once here, not on every paint.
+    """
+    src = np.frombuffer(samples, np.uint8).reshape(h, stride)[:, :w * 3].reshape(h, w, 3)
+    out = np.empty((h, w, 4), np.uint8)
+    if sys.byteorder == "little":  # bytes B, G, R, 0xff
+        out[..., 2::-1] = src
+        out[..., 3] = 255
+    else:                          # bytes 0xff, R, G, B
+        out[..., 0] = 255
+        out[..., 1:] = src
+    return out
+
+def _make_entry(pixels: np.ndarray, dpr: float) -> _Entry:
+    # build QImage with DPR for HiDPI, painting straight from the entry's own buffer
+    h, w = pixels.shape[:2]
+    img = QtGui.QImage(pixels.data, w, h, w * 4, QtGui.QImage.Format_RGB32)
+    img.setDevicePixelRatio(dpr)
+    return _Entry(pixels, w, h, w * 4, dpr, img, (int(w / dpr), int(h / dpr)))
+
+@lru_cache(maxsize=64)
+def _scale_matrix(scale: float) -> fitz.Matrix:
+    """Shared (read-only) matrix per bucketed scale: a session only sees a few dozen."""
+    return fitz.Matrix(scale, scale)
+
+# ---- prefetch worker (runs in a child process: MuPDF must not be driven from several threads) ----
+_worker_doc: Optional[Tuple[Tuple[str, int], "fitz.Document"]] = None
+
+def _mtime_ns(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return 0  # let fitz.open report the real error
+
+def _render_pixels(path: str, mtime_ns: int, page_index: int, scale: float) -> np.ndarray:
+    """
+    Format_RGB32 pixels of one page of `path` as of `mtime_ns` (when the parent opened it);
+    the document stays open in the worker for the next call with the same file version.
+    """
+    global _worker_doc
+    if _worker_doc is None or _worker_doc[0] != (path, mtime_ns):
+        if _worker_doc is not None:
+            _worker_doc[1].close()
+            _worker_doc = None
+        if _mtime_ns(path) != mtime_ns:
+            # changed on disk since the parent opened it: never mix pages of two versions
+            raise RuntimeError(f"{path} changed on disk")
+        _worker_doc = ((path, mtime_ns), fitz.open(path))
+    pix = _worker_doc[1].load_page(page_index).get_pixmap(matrix=_scale_matrix(scale), alpha=False)
+    return _rgb32(pix.samples, pix.width, pix.height, pix.stride)
+
 @dataclass
 class _RenderCache:
-    # key: (page_index, scale_bucket, dpr_bucket)
-    images: Dict[Tuple[int, float, float], QtGui.QImage] = field(default_factory=dict)
-    order: list[Tuple[int, float, float]] = field(default_factory=list)
+    """
+    LRU of rendered pages with a TinyLFU-style admission filter: when full, a new render
+    only evicts the LRU entry if it has been requested at least as often. A resize drag
+    produces many one-off (page, scale) keys; they no longer flush the settled page.
+    """
+    # key: (page_index, scale_bucket, dpr_bucket); insertion order = recency (LRU first)
+    images: "OrderedDict[Tuple[int, float, float], _Entry]" = field(default_factory=OrderedDict)
     capacity: int = 12
+    # count-min sketch: 128 saturating 4-bit counters, two per key; halved every `_SKETCH_WINDOW` bumps
+    _sketch: bytearray = field(default_factory=lambda: bytearray(128))
+    _bumps: int = 0
 
-    def get(self, key):
-        return self.images.get(key)
+    _SKETCH_WINDOW = 256
 
-    def put(self, key, img: QtGui.QImage):
-        if key in self.images:
-            # move to end
-            self.order.remove(key)
-            self.order.append(key)
-            self.images[key] = img
-            return
-        self.images[key] = img
-        self.order.append(key)
-        while len(self.order) > self.capacity:
-            k = self.order.pop(0)
-            self.images.pop(k, None)
+    def __contains__(self, key) -> bool:
+        return key in self.images  # membership only: not a use, no sketch bump
+
+    def get(self, key) -> Optional[_Entry]:
+        """
+        Safe without the owner's lock: each step is one GIL-atomic call on a builtin
+        container. A racing put() can at worst drop a sketch bump or the recency update.
+        """
+        self._bump(key)
+        entry = self.images.get(key)
+        if entry is not None:
+            # a hit counts as a use: keep recently viewed pages resident (LRU, not FIFO)
+            try:
+                self.images.move_to_end(key)
+            except KeyError:
+                pass  # evicted by a concurrent put() since the lookup; the caller still has it
+        return entry
+
+    def put(self, key, entry: _Entry, admit: bool = False):
+        """
+        Cache `entry`. `admit=True` skips the admission filter: for prefetched pages, which
+        were rendered because they are about to be shown but have not been requested yet
+        (one sketch bump against the two of every page already viewed).
+        """
+        self._bump(key)
+        if not admit and key not in self.images and len(self.images) >= self.capacity:
+            victim = next(iter(self.images))
+            if self._freq(victim) > self._freq(key):
+                return  # not admitted: the caller still gets its image, it just isn't cached
+        self.images[key] = entry
+        self.images.move_to_end(key)
+        while len(self.images) > self.capacity:
+            self.images.popitem(last=False)
+
+    # ---- frequency sketch ----
+    def _bump(self, key) -> None:
+        h = hash(key)
+        sk = self._sketch
+        for i in (h & 127, (h >> 16) & 127):
+            if sk[i] < 15:
+                sk[i] += 1
+        self._bumps += 1
+        if self._bumps >= self._SKETCH_WINDOW:  # age: old popularity fades
+            self._bumps = 0
+            for i in range(len(sk)):
+                sk[i] >>= 1
+
+    def _freq(self, key) -> int:
+        h = hash(key)
+        return min(self._sketch[h & 127], self._sketch[(h >> 16) & 127])
 
 class PdfIO:
     """
@@ -39,23 +157,43 @@ class PdfIO:
     - set_zoom(z)  # explicit zoom; disables auto-fit
     - enable_fit_width(True/False)
     - fit_to_width(view_px, dpr): re-render using scale computed from page rect
+    - shutdown(): stop the prefetch workers (on app quit)
+
+    After each render, the neighbouring pages (at the same scale/DPR) are prefetched
+    into the render cache by `workers` background processes (0 disables prefetch).
     """
+    _PREFETCH = (-1, 1, 2)  # page offsets rendered ahead of a page turn
+    _DLIST_PAGES = 4        # parsed pages kept for re-rendering at another zoom
+
     def __init__(self, cache_pages: int = 12, workers: int = 2):
         self._doc: Optional[fitz.Document] = None
+        self._path: Optional[str] = None
+        self._mtime = 0  # st_mtime_ns of `_path` at open(): the file version workers must render
         self.page_count = 0
         self.page = 0
         self.zoom = 1.0
-        self._cache = _RenderCache(capacity=cache_pages)
+        self._cache = _RenderCache(capacity=max(1, int(cache_pages)))
         self._lock = threading.Lock()
-        self._last: Optional[QtGui.QImage] = None
+        self._last: Optional[_Entry] = None  # holds the shown image's pixel buffer alive
         self._fit_width_enabled = True
         self._max_scale = 8.0  # allow high DPI
         self._page_width_pts: Optional[float] = None  # points at 72dpi for current page
+        # prefetch: pool is started on first use; `_gen` drops results that finish after close()
+        self._workers = max(0, int(workers))
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending: Dict[Tuple[int, float, float], Future] = {}
+        self._prefetch_at: Optional[Tuple[float, float]] = None  # (scale, dpr) of the latest prefetch
+        # page_index -> fitz.DisplayList: the page's content parsed once, rasterized at any scale
+        self._dlists: "OrderedDict[int, fitz.DisplayList]" = OrderedDict()
+        self._page_rects: Dict[int, fitz.Rect] = {}  # page_index -> page rect (points)
+        self._gen = 0
 
     # ------------- lifecycle -------------
     def open(self, path: str):
         self.close()
+        self._mtime = _mtime_ns(path)
         self._doc = fitz.open(path)
+        self._path = path
         self.page_count = len(self._doc)
         self.page = 0
         self.zoom = 1.0
@@ -66,45 +204,78 @@ class PdfIO:
         if self._doc:
             self._doc.close()
         self._doc = None
+        self._path = None
         self.page_count = 0
         self.page = 0
-        self._cache = _RenderCache(capacity=self._cache.capacity)
+        with self._lock:
+            self._gen += 1
+            pending, self._pending = self._pending, {}
+            self._cache = _RenderCache(capacity=self._cache.capacity)
+            # each worker holds its last document open: retire them so the file is released
+            # now (renaming/deleting an open file fails on Windows); the next prefetch respawns
+            pool, self._pool = self._pool, None
+        self._dlists.clear()
+        self._page_rects.clear()
+        for fut in pending.values():  # outside the lock: cancel() runs the done callbacks
+            fut.cancel()
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
         self._last = None
         self._page_width_pts = None
 
+    def shutdown(self):
+        """Close the document and stop the prefetch workers."""
+        self.close()
+
     # ------------- controls -------------
+    # each setter is a no-op when nothing changes: the current render stays valid
+
     def nav(self, delta: int):
         if not self._doc or self.page_count == 0:
             return
-        self.page = max(0, min(self.page + delta, self.page_count - 1))
-        self._page_width_pts = None
-        self._last = None  # force re-render
+        self.set_page(self.page + delta)
 
     def set_page(self, i: int):
         if not self._doc:
             return
-        self.page = max(0, min(i, self.page_count - 1))
+        page = max(0, min(i, self.page_count - 1))
+        if page == self.page:
+            return
+        self.page = page
         self._page_width_pts = None
-        self._last = None
+        self._last = None  # force re-render
 
     def set_zoom(self, z: float):
         """Manual zoom: disable fit-width and render at this zoom (1.0 = 72dpi scale)."""
+        zoom = max(0.25, min(z, self._max_scale))
+        if not self._fit_width_enabled and zoom == self.zoom:
+            return
         self._fit_width_enabled = False
-        self.zoom = max(0.25, min(z, self._max_scale))
+        self.zoom = zoom
         self._last = None  # will re-render on next qimage()
 
     def enable_fit_width(self, enabled: bool):
-        self._fit_width_enabled = bool(enabled)
+        enabled = bool(enabled)
+        if enabled == self._fit_width_enabled:
+            return
+        self._fit_width_enabled = enabled
         self._last = None
 
     # ------------- rendering -------------
     def qimage(self) -> QtGui.QImage:
         """Return the last rendered image, rendering if necessary."""
-        if self._last is not None:
-            return self._last
-        # If not rendered yet, render at current zoom (non-fit path) as fallback.
-        self._last = self._render_by_zoom(self.page, self.zoom, dpr=1.0)
-        return self._last
+        if self._last is None:
+            # If not rendered yet, render at current zoom (non-fit path) as fallback.
+            self._last = self._render_by_zoom(self.page, self.zoom, dpr=1.0)
+            if self._last is None:
+                return QtGui.QImage()
+        return self._last.qimg
+
+    def logical_size(self) -> Tuple[int, int]:
+        """Paint size of qimage() in logical pixels ((0, 0) when there is no page); fixed per render."""
+        if self._last is None and self.qimage().isNull():
+            return (0, 0)
+        return self._last.logical
 
     def fit_to_width(self, view_px: int, dpr: float):
         """Re-render current page to exactly fit the given view width at device DPR."""
@@ -127,38 +298,123 @@ class PdfIO:
             return
         if not self._doc:
             return
-        page = self._doc.load_page(self.page)
-        rect = page.rect  # points
+        rect = self._page_rect(self.page)  # points
         self._page_width_pts = rect.width
 
-    def _render_by_zoom(self, page_index: int, scale: float, dpr: float) -> QtGui.QImage:
+    def _page_rect(self, page_index: int) -> fitz.Rect:
+        """
+        Page rect in points, cached: fit recomputations during a resize drag touch no page
+        object, and a page that is not parsed yet is only loaded, not parsed, for its size.
+        """
+        rect = self._page_rects.get(page_index)
+        if rect is None:
+            dl = self._dlists.get(page_index)
+            rect = dl.rect if dl is not None else self._doc.load_page(page_index).rect
+            self._page_rects[page_index] = rect
+        return rect
+
+    def _display_list(self, page_index: int) -> fitz.DisplayList:
+        """
+        Parsed content of a page (LRU of `_DLIST_PAGES`). A zoom change re-rasterizes
+        it instead of re-interpreting the page's content stream.
+        """
+        dl = self._dlists.get(page_index)
+        if dl is None:
+            dl = self._dlists[page_index] = self._doc.load_page(page_index).get_displaylist()
+            while len(self._dlists) > self._DLIST_PAGES:
+                self._dlists.popitem(last=False)
+        else:
+            self._dlists.move_to_end(page_index)
+        return dl
+
+    def _render_by_zoom(self, page_index: int, scale: float, dpr: float) -> Optional[_Entry]:
         """Render using PyMuPDF at given scale (72dpi base) and attach DPR for sharp painting."""
         if not self._doc:
-            return QtGui.QImage()
+            return None
 
         # bucket to avoid overcaching nearly-identical scales
         scale_b = round(scale, 3)
         dpr_b = round(max(1.0, dpr), 2)
         key = (page_index, scale_b, dpr_b)
 
+        entry = self._cache.get(key)  # lock-free probe: the page-turn hit path takes no lock
+        pending = None
+        if entry is None:
+            with self._lock:
+                pending = self._pending.get(key)
+
+        if entry is None and pending is not None and not pending.cancel():
+            # a worker is already rendering this page: wait for it rather than render twice
+            try:
+                entry = self._store_pixels(key, pending.result())
+            except Exception:
+                entry = None
+        if entry is None:
+            mat = _scale_matrix(scale_b)
+            pix = self._display_list(page_index).get_pixmap(matrix=mat, alpha=False)  # bg white; set alpha=True if you need transparency
+            entry = _make_entry(_rgb32(pix.samples, pix.width, pix.height, pix.stride), dpr_b)
+            with self._lock:
+                self._cache.put(key, entry)
+
+        self._prefetch(page_index, scale_b, dpr_b)
+        return entry
+
+    def _prefetch(self, page_index: int, scale_b: float, dpr_b: float) -> None:
+        """Queue background renders of the neighbouring pages; duplicates coalesce on `_pending`."""
+        if not self._workers or not self._path:
+            return
+        queued = []
         with self._lock:
-            cached = self._cache.get(key)
-            if cached is not None:
-                return cached
-
-        page = self._doc.load_page(page_index)
-        mat = fitz.Matrix(scale_b, scale_b)
-        pix = page.get_pixmap(matrix=mat, alpha=False)  # bg white; set alpha=True if you need transparency
-
-        # build QImage with DPR for HiDPI
-        img = QtGui.QImage(pix.samples, pix.width, pix.height, pix.stride, QtGui.QImage.Format_RGB888)
-        img.setDevicePixelRatio(dpr_b)
-        img = img.copy()  # detach from pixmap buffer
-
+            # a new scale/DPR (resize drag, zoom) makes queued neighbours at the old one useless
+            self._prefetch_at = (scale_b, dpr_b)
+            stale = [k for k in self._pending if k[1:] != self._prefetch_at]
+            stale_futs = [self._pending.pop(k) for k in stale]
+            for d in self._PREFETCH:
+                p = page_index + d
+                key = (p, scale_b, dpr_b)
+                if not 0 <= p < self.page_count or key in self._cache or key in self._pending:
+                    continue
+                if self._pool is None:
+                    # spawn, not fork: forking a process that runs Qt threads is unsafe
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self._workers, mp_context=multiprocessing.get_context("spawn"))
+                try:
+                    fut = self._pool.submit(_render_pixels, self._path, self._mtime, p, scale_b)
+                except RuntimeError as e:  # broken pool: keep rendering on demand only
+                    print(f"[pdfio] prefetch disabled: {e}")
+                    self._workers = 0
+                    break
+                self._pending[key] = fut
+                queued.append((key, fut))
+            gen = self._gen
+        # outside the lock: cancel() and an already-done future run their callbacks right here
+        for fut in stale_futs:
+            fut.cancel()  # no-op if a worker already started it; _prefetch_done drops the result
+        for key, fut in queued:
+            fut.add_done_callback(lambda f, key=key: self._prefetch_done(key, gen, f))
+
+    def _prefetch_done(self, key, gen: int, fut: Future) -> None:
         with self._lock:
-            self._cache.put(key, img)
-
-        return img
+            if gen != self._gen:
+                return  # document closed meanwhile
+            if self._pending.get(key) is fut:
+                self._pending.pop(key)
+            if key[1:] != self._prefetch_at:
+                return  # rendered at a scale the view has since left: don't let it evict anything
+        if fut.cancelled() or fut.exception() is not None:
+            return  # best-effort: the page is rendered on demand instead
+        self._store_pixels(key, fut.result(), gen)
+
+    def _store_pixels(self, key, pixels: np.ndarray, gen: Optional[int] = None) -> _Entry:
+        """Cache entry for worker-rendered pixels (reusing one already cached for `key`)."""
+        with self._lock:
+            if key in self._cache:
+                return self._cache.images[key]
+        entry = _make_entry(pixels, key[2])
+        with self._lock:
+            if gen is None or gen == self._gen:
+                self._cache.put(key, entry, admit=True)
+        return entry
 
         # pdfio.py (add this to PdfIO)
 
@@ -169,8 +425,7 @@ class PdfIO:
         """
         if not self._doc or self.page_count == 0:
             return
-        page = self._doc.load_page(self.page)
-        rect = page.rect  # points @ 72dpi
+        rect = self._page_rect(self.page)  # points @ 72dpi
         page_w_pts, page_h_pts = rect.width, rect.height
         if page_w_pts <= 0 or page_h_pts <= 0:
             return
@@ -196,8 +451,7 @@ class PdfIO:
         """Return (width_pts, height_pts) for the current page."""
         if not self._doc:
             return (0.0, 0.0)
-        page = self._doc.load_page(self.page)
-        r = page.rect
+        r = self._page_rect(self.page)
         return (float(r.width), float(r.height))
 
     def rect_pdfpt_to_qrectf(self, rect_pt: tuple[float, float, float, float], img: QtGui.QImage) -> QtCore.QRectF:
@@ -1,13 +1,30 @@
 from __future__ import annotations
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 
 try:
     import yaml  # type: ignore
     _HAS_YAML = True
+    # libyaml's C loader when PyYAML was built with it
+    _YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 except Exception:
     _HAS_YAML = False
 
+# path -> ((mtime_ns, size), parsed document): unchanged files are parsed once per process
+_PARSED: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+def _load_yaml(path: Path) -> Any:
+    """Parsed YAML document at `path`; shared with earlier callers, so treat it as read-only."""
+    st = path.stat()
+    stamp = (st.st_mtime_ns, st.st_size)
+    key = str(path)
+    hit = _PARSED.get(key)
+    if hit is not None and hit[0] == stamp:
+        return hit[1]
+    data = yaml.load(path.read_text(encoding="utf-8"), Loader=_YAML_LOADER) or {}
+    _PARSED[key] = (stamp, data)
+    return data
+
 def load_plugin_specs(path: Optional[str | Path]) -> Dict[str, Dict[str, Any]]:
     """
     Load YAML plugin specs from a directory (optional).
@@ -20,7 +37,7 @@ def load_plugin_specs(path: Optional[str | Path]) -> Dict[str, Dict[str, Any]]:
     if not p.exists() or not p.is_dir():
         return specs
     for yml in sorted(p.glob("*.yaml")):
-        data = (yaml.safe_load(yml.read_text(encoding="utf-8")) or {})
+        data = _load_yaml(yml)
         # Allow single or multi-component files
         if "components" in data and isinstance(data["components"], list):
             for spec in data["components"]:
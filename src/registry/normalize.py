@@ -1,22 +1,82 @@
 from __future__ import annotations
-from typing import Any, Dict, Optional, Tuple
+from functools import partial
+import math
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
 
 def _lc(x: Any) -> str:
     return str(x).strip().lower()
 
-def normalize_enum(value: Any, mapping: Dict[str, Any]) -> Tuple[bool, Any, Optional[str]]:
+def enum_lookup(mapping: Mapping[Any, Any]) -> Mapping[str, Any]:
+    """
+    Case-folded lookup for an enum field's `map`: every key and every canonical value
+    (case-insensitive) resolves to its canonical value; keys win on a clash.
+    """
+    lookup = {_lc(v): v for v in mapping.values()}
+    lookup.update((_lc(k), v) for k, v in mapping.items())
+    return MappingProxyType(lookup)
+
+def normalize_spec(type_id: str, spec: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Plain-dict copy of `spec` with defaults filled in (the input is not modified).
+    Raises ValueError if field_sequence names an undefined field.
+    """
+    spec = dict(spec)
+    spec.setdefault("label", type_id)
+    spec.setdefault("type_key", type_id)
+    spec.setdefault("field_sequence", [])
+    spec.setdefault("required_fields", [])
+    spec.setdefault("fields", {})
+    spec.setdefault("aliases", [])
+
+    # ensure sequence fields exist
+    fields = spec["fields"]
+    for fname in spec["field_sequence"]:
+        if fname not in fields:
+            raise ValueError(f"Spec for {type_id} references unknown field '{fname}' in field_sequence")
+
+    # plain dicts all the way down (shared read-only maps included): specs deepcopy and pickle
+    spec["fields"] = {
+        fname: {**fdef, "map": dict(fdef["map"])} if "map" in fdef else dict(fdef)
+        for fname, fdef in fields.items()
+    }
+    return spec
+
+def alias_keys(type_id: str, spec: Mapping[str, Any]) -> Tuple[str, ...]:
+    """Lowercased resolve_token keys of a normalized spec (aliases, type_id, label), deduped in order."""
+    return tuple(dict.fromkeys(_lc(t) for t in (*spec["aliases"], type_id, spec["label"]) if t))
+
+Validator = Callable[[Any], Tuple[bool, Any, Optional[str]]]
+
+def field_validators(type_id: str, spec: Mapping[str, Any]) -> Dict[Tuple[str, str], Validator]:
+    """
+    {(type_id, field): value -> (ok, normalized, error)} for a normalized spec: each field
+    is dispatched on its type (and an enum's lookup built) once, not per keystroke.
+    """
+    return {(type_id, fname): _validator(type_id, fname, fdef) for fname, fdef in spec["fields"].items()}
+
+def _validator(type_id: str, fname: str, fdef: Mapping[str, Any]) -> Validator:
+    ftype = fdef.get("type", "enum")
+    if ftype == "enum":
+        return partial(normalize_enum, lookup=enum_lookup(fdef.get("map", {})))
+    if ftype == "bool":
+        return normalize_bool
+    if ftype == "int":
+        return partial(normalize_int, min_val=fdef.get("min"), max_val=fdef.get("max"))
+    if ftype == "number":
+        return partial(normalize_number, min_val=fdef.get("min"), max_val=fdef.get("max"))
+    return partial(_unsupported, f"Unsupported field type '{ftype}' for {type_id}.{fname}")
+
+def _unsupported(error: str, value: Any) -> Tuple[bool, Any, Optional[str]]:
+    return False, None, error
+
+def normalize_enum(value: Any, lookup: Mapping[str, Any]) -> Tuple[bool, Any, Optional[str]]:
+    """`lookup` as built by enum_lookup()."""
     if value is None:
         return False, None, "Value is required."
     key = _lc(value)
-    if key in mapping:
-        return True, mapping[key], None
-    # allow canonical values directly (case-insensitive)
-    canon_vals = set(mapping.values())
-    if value in canon_vals:
-        return True, value, None
-    lower_to_canon = { _lc(v): v for v in canon_vals }
-    if _lc(value) in lower_to_canon:
-        return True, lower_to_canon[_lc(value)], None
+    if key in lookup:
+        return True, lookup[key], None
     return False, None, f"Invalid value: {value}"
 
 def normalize_bool(value: Any) -> Tuple[bool, Any, Optional[str]]:
@@ -34,10 +94,14 @@ def normalize_bool(value: Any) -> Tuple[bool, Any, Optional[str]]:
 def normalize_int(value: Any, min_val: Optional[int] = None, max_val: Optional[int] = None) -> Tuple[bool, Any, Optional[str]]:
     if value is None or value == "":
         return False, None, "Value is required."
-    try:
-        iv = int(value)
-    except Exception:
-        return False, None, f"Expected integer, got: {value}"
+    t = type(value)
+    if t is int:
+        iv = value  # already an int: no conversion
+    else:
+        try:
+            iv = int(value)
+        except Exception:
+            return False, None, f"Expected integer, got: {value}"
     if min_val is not None and iv < min_val:
         return False, None, f"Minimum is {min_val}"
     if max_val is not None and iv > max_val:
@@ -47,10 +111,16 @@ def normalize_int(value: Any, min_val: Optional[int] = None, max_val: Optional[i
 def normalize_number(value: Any, min_val: Optional[float] = None, max_val: Optional[float] = None) -> Tuple[bool, Any, Optional[str]]:
     if value is None or value == "":
         return False, None, "Value is required."
-    try:
-        fv = float(value)
-    except Exception:
-        return False, None, f"Expected number, got: {value}"
+    t = type(value)
+    if t is float:
+        fv = value  # already a float: no conversion
+    else:
+        try:
+            fv = float(value)
+        except Exception:
+            return False, None, f"Expected number, got: {value}"
+    if not math.isfinite(fv):  # NaN/inf: not valid JSON, and the two export backends disagree on them
+        return False, None, f"Expected a finite number, got: {value}"
     if min_val is not None and fv < min_val:
         return False, None, f"Minimum is {min_val}"
     if max_val is not None and fv > max_val:
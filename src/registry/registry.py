@@ -1,10 +1,11 @@
 from __future__ import annotations
-from typing import Dict, Any, Optional, Tuple, Iterable
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
+import sys
 
 from state.protocol import RegistryProtocol  # uses your existing protocol
-from .normalize import normalize_enum, normalize_bool, normalize_int, normalize_number
-from .specs import BUILTIN_SPECS
+from .normalize import Validator, alias_keys, field_validators, normalize_spec
+from .specs import BUILTIN_ALIAS_KEYS, BUILTIN_SPECS_NORMALIZED, BUILTIN_VALIDATORS
 from .loader import load_plugin_specs
 
 def _lc(x: Any) -> str:
@@ -19,12 +20,14 @@ class PluginRegistry(RegistryProtocol):
     """
 
     def __init__(self, plugins_dir: Optional[str | Path] = None, extra_specs: Optional[Dict[str, Dict[str, Any]]] = None):
-        self._specs: Dict[str, Dict[str, Any]] = {}
         self._aliases: Dict[str, str] = {}
 
-        # 1) built-ins
-        for tid, spec in BUILTIN_SPECS.items():
-            self._register_spec(tid, spec)
+        # 1) built-ins: normalized once at import; shallow copies so add_aliases stays per-registry
+        self._specs: Dict[str, Dict[str, Any]] = {tid: dict(spec) for tid, spec in BUILTIN_SPECS_NORMALIZED.items()}
+        # private per-spec data, kept out of the specs handed to callers:
+        # (type_id, field) -> bound validator, and type_id -> lowercased resolve_token keys
+        self._validators: Dict[Tuple[str, str], Validator] = dict(BUILTIN_VALIDATORS)
+        self._alias_keys: Dict[str, Tuple[str, ...]] = dict(BUILTIN_ALIAS_KEYS)
 
         # 2) caller-provided extra specs (override/extend)
         if extra_specs:
@@ -42,60 +45,73 @@ class PluginRegistry(RegistryProtocol):
     def resolve_token(self, token: str) -> Optional[str]:
         if not token:
             return None
-        return self._aliases.get(_lc(token))
+        if not isinstance(token, str):
+            return self._aliases.get(_lc(token))
+        # typed input is usually already stripped + lowercase: then strip() returns
+        # `token` itself and lower() is skipped, leaving one dict lookup
+        k = token.strip()
+        return self._aliases.get(k if k.islower() else k.lower())
 
     def get_spec(self, type_id: str) -> Dict[str, Any]:
         return self._specs.get(type_id, {})
 
     def validate_value(self, type_id: str, field: str, value: Any) -> Tuple[bool, Any, Optional[str]]:
-        spec = self._specs.get(type_id)
-        if not spec:
+        validator = self._validators.get((type_id, field))
+        if validator is not None:
+            return validator(value)
+        if not self._specs.get(type_id):
             return False, None, f"Unknown component type: {type_id}"
-        fields = spec.get("fields", {})
-        fdef = fields.get(field)
-        if not fdef:
-            return False, None, f"Unknown field for {type_id}: {field}"
-
-        ftype = fdef.get("type", "enum")
-        if ftype == "enum":
-            mapping = { _lc(k): v for k, v in fdef.get("map", {}).items() }
-            return normalize_enum(value, mapping)
-        if ftype == "bool":
-            return normalize_bool(value)
-        if ftype == "int":
-            return normalize_int(value, fdef.get("min"), fdef.get("max"))
-        if ftype == "number":
-            return normalize_number(value, fdef.get("min"), fdef.get("max"))
-
-        return False, None, f"Unsupported field type '{ftype}' for {type_id}.{field}"
+        return False, None, f"Unknown field for {type_id}: {field}"
+
+    # ----- aliases (e.g. from config.yaml) -----
+
+    def add_alias(self, token: str, target: str) -> None:
+        """Map `token` to `target` (a type_id, or a token that already resolves to one)."""
+        self.add_aliases({token: target})
+
+    def add_aliases(self, aliases: Dict[str, str]) -> None:
+        """
+        Register extra tokens in one pass; explicit aliases override built-in ones.
+        Valid entries are applied even if some targets are unknown; those raise ValueError afterwards.
+        """
+        by_type: Dict[str, list[str]] = {}
+        unknown: list[str] = []
+        for token, target in aliases.items():
+            tid = target if target in self._specs else self.resolve_token(target)
+            if not tid:
+                unknown.append(f"{token} -> {target}")
+                continue
+            by_type.setdefault(tid, []).append(token)
+
+        for tid, tokens in by_type.items():
+            spec = self._specs[tid]
+            known = set(spec["aliases"])
+            # new list: the original may be shared with BUILTIN_SPECS
+            spec["aliases"] = list(spec["aliases"]) + [t for t in tokens if t not in known]
+            keys = [_lc(t) for t in tokens]
+            self._alias_keys[tid] = tuple(dict.fromkeys((*self._alias_keys[tid], *keys)))
+            for k in keys:
+                self._aliases[sys.intern(k)] = tid
+
+        if unknown:
+            raise ValueError(f"Aliases target unknown components: {', '.join(unknown)}")
 
     # ----- internal plumbing -----
 
     def _register_spec(self, type_id: str, spec: Dict[str, Any]) -> None:
-        spec = dict(spec)
-        spec.setdefault("label", type_id)
-        spec.setdefault("type_key", type_id)
-        spec.setdefault("field_sequence", [])
-        spec.setdefault("required_fields", [])
-        spec.setdefault("fields", {})
-        spec.setdefault("aliases", [])
-
-        # ensure sequence fields exist
-        fields = spec["fields"]
-        for fname in spec["field_sequence"]:
-            if fname not in fields:
-                raise ValueError(f"Spec for {type_id} references unknown field '{fname}' in field_sequence")
-
-        self._specs[type_id] = spec
+        old = self._specs.get(type_id)
+        if old is not None:  # an override replaces the whole spec, fields included
+            for fname in old["fields"]:
+                self._validators.pop((type_id, fname), None)
+        spec = self._specs[type_id] = normalize_spec(type_id, spec)
+        self._validators.update(field_validators(type_id, spec))
+        self._alias_keys[type_id] = alias_keys(type_id, spec)
 
     def _rebuild_alias_index(self) -> None:
-        self._aliases.clear()
-        for tid, spec in self._specs.items():
-            tokens: Iterable[str] = list(spec.get("aliases", [])) + [tid, spec.get("label", "")]
-            for t in tokens:
-                if not t:
-                    continue
-                self._aliases.setdefault(_lc(t), tid)  # first writer wins
+        # keys are precomputed per spec; walking specs in reverse lets the first writer win
+        self._aliases = {
+            sys.intern(k): tid for tid in reversed(self._specs) for k in self._alias_keys[tid]
+        }
     
     def all_specs(self) -> dict:
         """
@@ -11,9 +11,32 @@ Spec shape per type_id:
   },
   "aliases": ["token1","token2",...]
 }
+
+Enum maps that several fields share are single read-only objects, and the
+whole table is frozen: registries copy what they need to change.
 """
+from types import MappingProxyType
+
+from .normalize import alias_keys, field_validators, normalize_spec
 
-BUILTIN_SPECS = {
+_MOUNT_MAP = MappingProxyType({
+    "m":"Remote","remote":"Remote",
+    "l":"Left","left":"Left",
+    "r":"Right","right":"Right",
+    "e":"End","end":"End",
+})
+_MOUNT_MAP_WITH_NONE = MappingProxyType({**_MOUNT_MAP, "n":"None", "none":"None"})
+_LR_MAP = MappingProxyType({
+    "l":"Left","left":"Left",
+    "r":"Right","right":"Right",
+})
+_SIDE_MAP_WITH_NONE = MappingProxyType({
+    **_LR_MAP,
+    "e":"End","end":"End",
+    "n":"None","none":"None",
+})
+
+_BUILTIN_SPECS = {
     # ---------- ECM (EC fan arrays) ----------
     "ECM": {
         "label": "EC Fans",
@@ -21,12 +44,7 @@ BUILTIN_SPECS = {
         "field_sequence": ["mounting_location", "backdraft_dampers", "vertically_mounted"],
         "required_fields": ["mounting_location"],
         "fields": {
-            "mounting_location": {"type": "enum", "map": {
-                "m":"Remote","remote":"Remote",
-                "l":"Left","left":"Left",
-                "r":"Right","right":"Right",
-                "e":"End","end":"End",
-            }},
+            "mounting_location": {"type": "enum", "map": _MOUNT_MAP},
             "backdraft_dampers": {"type": "bool"},
             "vertically_mounted": {"type": "bool"},
         },
@@ -41,20 +59,8 @@ BUILTIN_SPECS = {
         "required_fields": [],
         "fields": {
             "vertically_mounted": {"type":"bool"},
-            "vfd_mount": {"type": "enum", "map": {
-                "m":"Remote","remote":"Remote",
-                "l":"Left","left":"Left",
-                "r":"Right","right":"Right",
-                "e":"End","end":"End",
-                "n":"None","none":"None",
-            }},
-            "jbox_mount": {"type": "enum", "map": {
-                "m":"Remote","remote":"Remote",
-                "l":"Left","left":"Left",
-                "r":"Right","right":"Right",
-                "e":"End","end":"End",
-                "n":"None","none":"None",
-            }},
+            "vfd_mount": {"type": "enum", "map": _MOUNT_MAP_WITH_NONE},
+            "jbox_mount": {"type": "enum", "map": _MOUNT_MAP_WITH_NONE},
         },
         "aliases": ["ddpl","ddlf","ddl","direct_drive_plenum"],
     },
@@ -73,10 +79,7 @@ BUILTIN_SPECS = {
         ],
         "required_fields": ["handing","construction"],
         "fields": {
-            "handing": {"type":"enum","map":{
-                "l":"Left","left":"Left",
-                "r":"Right","right":"Right",
-            }},
+            "handing": {"type":"enum","map":_LR_MAP},
             "face_bypass_damper": {"type":"bool"},
             "construction": {"type":"enum","map":{
                 "single":"Single","s":"Single",
@@ -85,22 +88,10 @@ BUILTIN_SPECS = {
             "staggered": {"type":"bool"},
             "kits_included": {"type":"bool"},
             "kits_qty": {"type":"int","min":0},
-            "kits_mount": {"type":"enum","map":{
-                "m":"Remote","remote":"Remote",
-                "l":"Left","left":"Left",
-                "r":"Right","right":"Right",
-                "e":"End","end":"End",
-                "n":"None","none":"None",
-            }},
+            "kits_mount": {"type":"enum","map":_MOUNT_MAP_WITH_NONE},
             "controllers_included": {"type":"bool"},
             "controllers_qty": {"type":"int","min":0},
-            "controllers_mount": {"type":"enum","map":{
-                "m":"Remote","remote":"Remote",
-                "l":"Left","left":"Left",
-                "r":"Right","right":"Right",
-                "e":"End","end":"End",
-                "n":"None","none":"None",
-            }},
+            "controllers_mount": {"type":"enum","map":_MOUNT_MAP_WITH_NONE},
         },
         "aliases": ["coil","coils","cw_coil","hw_coil"],
     },
@@ -124,10 +115,7 @@ BUILTIN_SPECS = {
         "field_sequence": ["handing","heater_size"],
         "required_fields": ["handing","heater_size"],
         "fields": {
-            "handing": {"type":"enum","map":{
-                "l":"Left","left":"Left",
-                "r":"Right","right":"Right",
-            }},
+            "handing": {"type":"enum","map":_LR_MAP},
             "heater_size": {"type":"enum","map":{
                 "1":"Single","single":"Single",
                 "2":"Rack","rack":"Rack",
@@ -143,10 +131,7 @@ BUILTIN_SPECS = {
         "field_sequence": ["handing"],
         "required_fields": ["handing"],
         "fields": {
-            "handing": {"type":"enum","map":{
-                "l":"Left","left":"Left",
-                "r":"Right","right":"Right",
-            }},
+            "handing": {"type":"enum","map":_LR_MAP},
         },
         "aliases": ["electric","eh","elec_heater","heater_electric"],
     },
@@ -158,10 +143,7 @@ BUILTIN_SPECS = {
         "field_sequence": ["handing","type"],
         "required_fields": ["handing","type"],
         "fields": {
-            "handing": {"type":"enum","map":{
-                "l":"Left","left":"Left",
-                "r":"Right","right":"Right",
-            }},
+            "handing": {"type":"enum","map":_LR_MAP},
             "type": {"type":"enum","map":{
                 "wahp":"WAHP","wrap":"WAHP","wraparound":"WAHP",
                 "sbs":"SBS",
@@ -204,12 +186,7 @@ BUILTIN_SPECS = {
         "fields": {
             "qty": {"type":"int","min":1,"max":2},
             "bypass_dampers": {"type":"int","min":0,"max":2},
-            "vfd_mount": {"type":"enum","map":{
-                "l":"Left","left":"Left",
-                "r":"Right","right":"Right",
-                "e":"End","end":"End",
-                "n":"None","none":"None",
-            }},
+            "vfd_mount": {"type":"enum","map":_SIDE_MAP_WITH_NONE},
         },
         "aliases": ["wheel","rotary","erw","wheel_hex","rotor"],
     },
@@ -257,3 +234,17 @@ BUILTIN_SPECS = {
         "aliases": ["misc","lights","grating","door","afms"],
     },
 }
+
+BUILTIN_SPECS = MappingProxyType({tid: MappingProxyType(spec) for tid, spec in _BUILTIN_SPECS.items()})
+
+# Defaults filled in, validators (enum lookups) and resolve_token keys built once per
+# process; PluginRegistry copies these.
+BUILTIN_SPECS_NORMALIZED = MappingProxyType({
+    tid: MappingProxyType(normalize_spec(tid, spec)) for tid, spec in BUILTIN_SPECS.items()
+})
+BUILTIN_VALIDATORS = MappingProxyType({
+    key: v for tid, spec in BUILTIN_SPECS_NORMALIZED.items() for key, v in field_validators(tid, spec).items()
+})
+BUILTIN_ALIAS_KEYS = MappingProxyType({
+    tid: alias_keys(tid, spec) for tid, spec in BUILTIN_SPECS_NORMALIZED.items()
+})
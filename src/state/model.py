@@ -14,7 +14,7 @@ class CompStatus(Enum):
     COMMITTED = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class ComponentState:
     id: str
     type_id: str
@@ -23,7 +23,7 @@ class ComponentState:
     status: CompStatus = CompStatus.COMMITTED
 
 
-@dataclass
+@dataclass(slots=True)
 class SectionState:
     id: str
     number: int
@@ -32,7 +32,7 @@ class SectionState:
     components: List[ComponentState] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class EditingDraft:
     type_id: str
     label: str
@@ -41,7 +41,7 @@ class EditingDraft:
     values: Dict[str, Any] = field(default_factory=dict)  # partial fine
 
 
-@dataclass
+@dataclass(slots=True)
 class PDFState:
     path: Optional[str] = None
     page: int = 0
@@ -49,7 +49,7 @@ class PDFState:
     zoom: float = 1.0
 
 
-@dataclass
+@dataclass(slots=True)
 class AppState:
     pdf: PDFState = field(default_factory=PDFState)
     sections: List[SectionState] = field(default_factory=list)
@@ -58,21 +58,33 @@ class AppState:
     editing: Optional[EditingDraft] = None  # only in FIELD_EDITING
     dirty: bool = False
     last_autosave_at: float = 0.0
+    meta: Optional[Any] = None  # UI-owned extras (e.g. detected dimensions) read by the exporter
+    # section id -> position in `sections`; maintained by reduce (replaced, never mutated)
+    section_index: Dict[str, int] = field(default_factory=dict)
+
+    def section_position(self, section_id: Optional[str]) -> int:
+        """Position of the section with `section_id` in `sections`, or -1. O(1) via section_index."""
+        if section_id is None:
+            return -1
+        i = self.section_index.get(section_id)
+        if i is not None and i < len(self.sections) and self.sections[i].id == section_id:
+            return i
+        # index missing or stale (state built by hand): fall back to a scan
+        for i, sec in enumerate(self.sections):
+            if sec.id == section_id:
+                return i
+        return -1
 
     def get_active_section(self) -> Optional[SectionState]:
-        """Convenience lookup; O(n) but sections are small."""
-        if self.active_section_id is None:
-            return None
-        for s in self.sections:
-            if s.id == self.active_section_id:
-                return s
-        return None
-
-@dataclass
+        """Convenience lookup of the active section (None if unset/unknown)."""
+        i = self.section_position(self.active_section_id)
+        return self.sections[i] if i >= 0 else None
+
+@dataclass(slots=True)
 class EditingDraft:
     type_id: str
     label: str
-    field_sequence: list[str]        # current, filtered sequence shown to the user
+    field_sequence: tuple[str, ...]       # current, filtered sequence shown to the user
     index: int
     values: dict[str, Any]
-    base_field_sequence: list[str]   # NEW: original, full sequence from spec
+    base_field_sequence: tuple[str, ...]  # original, full sequence from spec (shared, read-only)
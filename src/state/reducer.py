@@ -1,8 +1,10 @@
 from __future__ import annotations
-from typing import List, Any, Optional
-from dataclasses import replace
-import copy
-import time
+from typing import List, Any, Optional, Callable, Dict, Sequence, Tuple, Type, TypeVar
+from functools import lru_cache
+import itertools
+import math
+import sys
+import weakref
 
 from .model import (
     AppState, SectionState, ComponentState, EditingDraft,
@@ -16,300 +18,448 @@ from .commands import (
 )
 from .protocol import RegistryProtocol
 
+_T = TypeVar("_T")
+
 
 def reduce(state: AppState, cmd: Command, registry: RegistryProtocol) -> AppState:
     """
     Pure state transformer. Never mutates the input state.
     Raises ValueError on impossible transitions; UI should generally guard.
-    """
-    s = copy.deepcopy(state)  # safe and simple; optimize later if profiling warrants
-
-    # --- Section creation ---
-    if isinstance(cmd, NewSection):
-        if s.mode == Mode.FIELD_EDITING and s.editing:
-            raise ValueError("Finish or cancel the current component before creating a new section.")
-        number = (s.sections[-1].number + 1) if s.sections else 1
-        sec = SectionState(
-            id=_new_id("sec", number),
-            number=number,
-            name=cmd.name,
-            length=cmd.length,
-        )
-        s.sections.append(sec)
-        s.active_section_id = sec.id
-        s.mode = Mode.SECTION_ACTIVE
-        s.dirty = True
-        return s
-
-    # --- Start component ---
-    if isinstance(cmd, StartComponent):
-        if s.mode != Mode.SECTION_ACTIVE:
-            raise ValueError("StartComponent requires an active section.")
-        active = s.get_active_section()
-        if not active:
-            raise ValueError("No active section found.")
-
-        type_id = cmd.type_id or (registry.resolve_token(cmd.token) if cmd.token else None)
-        if not type_id:
-            raise ValueError(f"Unknown component token/type: {cmd.token or cmd.type_id}")
-
-        spec = registry.get_spec(type_id)
-        base_seq: List[str] = list(spec.get("field_sequence", []))  # canonical / full
-        label: str = spec.get("label", type_id)
-
-        draft = EditingDraft(
-            type_id=type_id,
-            label=label,
-            field_sequence=[],                 # will be computed below
-            base_field_sequence=base_seq,      # keep canonical list forever
-            index=0,
-            values={f: None for f in base_seq} # values for ALL potential fields
-        )
 
-        # initial visibility from the canonical sequence
-        draft.field_sequence = _maybe_recompute_visible_sequence(
-            draft.type_id, draft.base_field_sequence, draft.values
-        )
-
-        s.editing = draft
-        s.mode = Mode.FIELD_EDITING
-        return s
-
-    # --- Set field value ---
-    if isinstance(cmd, SetFieldValue):
-        if s.mode != Mode.FIELD_EDITING or not s.editing:
-            raise ValueError("SetFieldValue requires an active draft.")
-        draft = s.editing
-        if draft.index < 0 or draft.index >= len(draft.field_sequence):
-            raise ValueError("Field index out of range.")
+    Updates are structural: only the objects on the changed path (state -> section ->
+    component / draft) are rebuilt, everything else is shared with `state`. Treat states
+    as copy-on-write: anything that mutates one in place must own it (Store keeps
+    snapshots by reference).
+    """
+    handler = _DISPATCH.get(type(cmd))
+    if handler is None:
+        handler = _handler_for_subclass(type(cmd))
+        if handler is None:
+            return state  # Unhandled command → no-op (future-proof)
+    return handler(state, cmd, registry)
+
+
+# ----- handlers: one per command type, (state, cmd, registry) -> new state -----
+
+# --- Section creation ---
+def _new_section(s: AppState, cmd: NewSection, registry: RegistryProtocol) -> AppState:
+    if s.mode == Mode.FIELD_EDITING and s.editing:
+        raise ValueError("Finish or cancel the current component before creating a new section.")
+    _check_length(cmd.length)
+    number = (s.sections[-1].number + 1) if s.sections else 1
+    sec = SectionState(
+        id=_new_id("sec", number),
+        number=number,
+        name=cmd.name,
+        length=cmd.length,
+    )
+    return _evolve(
+        s, sections=[*s.sections, sec], section_index={**s.section_index, sec.id: len(s.sections)},
+        active_section_id=sec.id, mode=Mode.SECTION_ACTIVE, dirty=True,
+    )
 
-        # Name of the field we're editing *in the visible (filtered) sequence*
-        field_name = draft.field_sequence[draft.index]
 
-        # Validate/normalize
-        ok, normalized, err = registry.validate_value(draft.type_id, field_name, cmd.value)
-        if not ok:
-            raise ValueError(err or f"Invalid value for {field_name}: {cmd.value}")
+# --- Start component ---
+def _start_component(s: AppState, cmd: StartComponent, registry: RegistryProtocol) -> AppState:
+    if s.mode != Mode.SECTION_ACTIVE:
+        raise ValueError("StartComponent requires an active section.")
+    active = s.get_active_section()
+    if not active:
+        raise ValueError("No active section found.")
+
+    type_id = cmd.type_id or (registry.resolve_token(cmd.token) if cmd.token else None)
+    if not type_id:
+        raise ValueError(f"Unknown component token/type: {cmd.token or cmd.type_id}")
+
+    type_id = sys.intern(type_id)  # identity-fast compares against _COIL & co.
+    label, base_seq, _ = _spec_info(registry, type_id)  # canonical / full (shared tuple)
+
+    values = dict.fromkeys(base_seq)  # values for ALL potential fields
+    draft = EditingDraft(
+        type_id=type_id,
+        label=label,
+        # initial visibility: base_seq itself, or a shared cached mask for gated types (Coil)
+        field_sequence=_maybe_recompute_visible_sequence(type_id, base_seq, values),
+        base_field_sequence=base_seq,      # keep canonical sequence forever
+        index=0,
+        values=values,
+    )
 
-        # Commit the value
-        draft.values[field_name] = normalized
-        s.dirty = True
+    return _evolve(s, editing=draft, mode=Mode.FIELD_EDITING)
 
-        # Apply conditional auto-defaults for Coil toggles BEFORE recomputing visibility
-        if draft.type_id == "Coil" and field_name in ("kits_included", "controllers_included"):
-            _coil_apply_auto_values(draft.values, field_name, normalized)
 
+# --- Set field value ---
+def _set_field_value(s: AppState, cmd: SetFieldValue, registry: RegistryProtocol) -> AppState:
+    if s.mode != Mode.FIELD_EDITING or not s.editing:
+        raise ValueError("SetFieldValue requires an active draft.")
+    draft = s.editing
+    if draft.index < 0 or draft.index >= len(draft.field_sequence):
+        raise ValueError("Field index out of range.")
+
+    # Name of the field we're editing *in the visible (filtered) sequence*
+    field_name = draft.field_sequence[draft.index]
+
+    # Validate/normalize; validate_value must return an immutable scalar (str/int/float/None):
+    # committed components share these values with the draft
+    ok, normalized, err = registry.validate_value(draft.type_id, field_name, cmd.value)
+    if not ok:
+        raise ValueError(err or f"Invalid value for {field_name}: {cmd.value}")
+
+    gated = field_name in _VISIBILITY_GATES.get(draft.type_id, ())
+    if s.dirty and not gated and not getattr(cmd, "auto_advance", False):
+        old = draft.values.get(field_name)
+        if old == normalized and type(old) is type(normalized):
+            return s  # same value re-entered: nothing but `dirty` would change, and it's set
+
+    # Commit the value (into a new dict: the old draft is shared with `state`)
+    values = {**draft.values, field_name: normalized}
+
+    # Apply conditional auto-defaults for Coil toggles BEFORE recomputing visibility
+    if gated and draft.type_id == _COIL:
+        _coil_apply_auto_values(values, field_name, normalized)
+
+    # Only a gate field (e.g. Coil kits/controllers toggles) can change visibility;
+    # otherwise the visible sequence and index stay as they are
+    new_seq = old_seq = draft.field_sequence
+    index = draft.index
+    if gated:
         # Recompute visible sequence ALWAYS from canonical base_field_sequence
-        old_seq = draft.field_sequence
         new_seq = _maybe_recompute_visible_sequence(
-            draft.type_id, draft.base_field_sequence, draft.values
+            draft.type_id, draft.base_field_sequence, values
         )
-        draft.field_sequence = new_seq
 
         # Adjust index if the current field vanished or we moved beyond bounds
-        if draft.index >= len(new_seq):
-            draft.index = max(0, len(new_seq) - 1)
+        if index >= len(new_seq):
+            index = max(0, len(new_seq) - 1)
         else:
-            cur_name = old_seq[draft.index] if draft.index < len(old_seq) else None
+            cur_name = old_seq[index] if index < len(old_seq) else None
             if cur_name and cur_name not in new_seq:
                 # try to jump to the next visible field after the old position
                 nxt_idx = None
-                for f in old_seq[draft.index + 1:]:
+                for f in old_seq[index + 1:]:
                     if f in new_seq:
                         nxt_idx = new_seq.index(f)
                         break
-                draft.index = (nxt_idx if nxt_idx is not None else min(draft.index, len(new_seq) - 1))
+                index = (nxt_idx if nxt_idx is not None else min(index, len(new_seq) - 1))
 
-        # Optional auto-advance (used by UI for one-tap numerics)
-        if getattr(cmd, "auto_advance", False):
-            last_idx = len(draft.field_sequence) - 1
-            if draft.index >= last_idx and _all_required_set(draft, registry):
-                return _commit_current_draft(s)
-            draft.index = min(draft.index + 1, last_idx)
+    draft = _evolve(draft, values=values, field_sequence=new_seq, index=index)
+    s = _evolve(s, editing=draft, dirty=True)
 
-        return s
-
-    # --- Reset section (clear components; optional length clear) ---
-    if isinstance(cmd, ResetSection):
-        sec = _find_section(s, cmd.section_id)
-        if not sec:
-            raise ValueError("Unknown section.")
-        sec.components.clear()
-        if cmd.clear_length:
-            sec.length = None
-        s.editing = None
-        s.mode = Mode.SECTION_ACTIVE
-        s.dirty = True
-        return s
-
-    # --- Next / Prev field ---
-    if isinstance(cmd, NextField):
-        if s.mode != Mode.FIELD_EDITING or not s.editing:
-            return s
-        draft = s.editing
+    # Optional auto-advance (used by UI for one-tap numerics)
+    if getattr(cmd, "auto_advance", False):
         last_idx = len(draft.field_sequence) - 1
         if draft.index >= last_idx and _all_required_set(draft, registry):
             return _commit_current_draft(s)
-        draft.index = min(draft.index + 1, last_idx)
-        return s
+        s.editing = _evolve(draft, index=min(draft.index + 1, last_idx))  # `s` is ours
 
-    if isinstance(cmd, PrevField):
-        if s.mode != Mode.FIELD_EDITING or not s.editing:
-            return s
-        draft = s.editing
-        draft.index = max(draft.index - 1, 0)
-        return s
+    return s
 
-    # --- Commit / Cancel draft ---
-    if isinstance(cmd, CommitComponent):
-        if s.mode != Mode.FIELD_EDITING or not s.editing:
-            return s
-        if not _all_required_set(s.editing, registry):
-            raise ValueError("Cannot commit: required fields are missing.")
-        return _commit_current_draft(s)
 
-    if isinstance(cmd, CancelDraft):
-        if s.mode != Mode.FIELD_EDITING or not s.editing:
-            return s
-        s.editing = None
-        s.mode = Mode.SECTION_ACTIVE
-        return s
+# --- Reset section (clear components; optional length clear) ---
+def _reset_section(s: AppState, cmd: ResetSection, registry: RegistryProtocol) -> AppState:
+    i = _section_index(s, cmd.section_id)
+    if i < 0:
+        raise ValueError("Unknown section.")
+    sec = s.sections[i]
+    sec = _evolve(sec, components=[], length=None if cmd.clear_length else sec.length)
+    return _evolve(
+        s, sections=_with_section(s, i, sec), editing=None,
+        mode=Mode.SECTION_ACTIVE, dirty=True,
+    )
 
-    # --- Section edits ---
-    if isinstance(cmd, RenameSection):
-        sec = _find_section(s, cmd.section_id)
-        if not sec:
-            raise ValueError("Unknown section.")
-        sec.name = cmd.name
-        s.dirty = True
-        return s
 
-    if isinstance(cmd, SetSectionLength):
-        sec = _find_section(s, cmd.section_id)
-        if not sec:
-            raise ValueError("Unknown section.")
-        sec.length = cmd.length
-        s.dirty = True
+# --- Next / Prev field ---
+def _next_field(s: AppState, cmd: NextField, registry: RegistryProtocol) -> AppState:
+    if s.mode != Mode.FIELD_EDITING or not s.editing:
         return s
+    draft = s.editing
+    last_idx = len(draft.field_sequence) - 1
+    if draft.index >= last_idx and _all_required_set(draft, registry):
+        return _commit_current_draft(s)
+    index = min(draft.index + 1, last_idx)
+    if index == draft.index:
+        return s  # on the last field with required values still missing
+    return _evolve(s, editing=_evolve(draft, index=index))
+
 
-    # --- PDF navigation (not dirty) ---
-    if isinstance(cmd, NavPage):
-        if s.pdf.page_count > 0:
-            s.pdf.page = max(0, min(s.pdf.page + cmd.delta, s.pdf.page_count - 1))
+def _prev_field(s: AppState, cmd: PrevField, registry: RegistryProtocol) -> AppState:
+    if s.mode != Mode.FIELD_EDITING or not s.editing:
         return s
+    draft = s.editing
+    index = max(draft.index - 1, 0)
+    if index == draft.index:
+        return s
+    return _evolve(s, editing=_evolve(draft, index=index))
 
-    if isinstance(cmd, SetPage):
-        if s.pdf.page_count > 0:
-            s.pdf.page = max(0, min(cmd.page, s.pdf.page_count - 1))
+
+# --- Commit / Cancel draft ---
+def _commit_component(s: AppState, cmd: CommitComponent, registry: RegistryProtocol) -> AppState:
+    if s.mode != Mode.FIELD_EDITING or not s.editing:
         return s
+    if not _all_required_set(s.editing, registry):
+        raise ValueError("Cannot commit: required fields are missing.")
+    return _commit_current_draft(s)
+
 
-    if isinstance(cmd, SetZoom):
-        s.pdf.zoom = max(0.25, min(cmd.zoom, 4.0))
+def _cancel_draft(s: AppState, cmd: CancelDraft, registry: RegistryProtocol) -> AppState:
+    if s.mode != Mode.FIELD_EDITING or not s.editing:
         return s
+    return _evolve(s, editing=None, mode=Mode.SECTION_ACTIVE)
 
-    # --- Save acknowledgment ---
-    if isinstance(cmd, MarkSaved):
-        s.dirty = False
-        s.last_autosave_at = cmd.when
+
+# --- Section edits ---
+def _rename_section(s: AppState, cmd: RenameSection, registry: RegistryProtocol) -> AppState:
+    i = _section_index(s, cmd.section_id)
+    if i < 0:
+        raise ValueError("Unknown section.")
+    if s.dirty and s.sections[i].name == cmd.name:
         return s
+    sec = _evolve(s.sections[i], name=cmd.name)
+    return _evolve(s, sections=_with_section(s, i, sec), dirty=True)
 
-    # --- Section navigation (not dirty) ---
-    if isinstance(cmd, PrevSection):
-        if s.sections:
-            cur_idx = 0
-            if s.active_section_id:
-                for i, sec in enumerate(s.sections):
-                    if sec.id == s.active_section_id:
-                        cur_idx = i
-                        break
-            new_idx = max(0, cur_idx - 1)
-            s.active_section_id = s.sections[new_idx].id
-            s.mode = Mode.SECTION_ACTIVE
+
+def _set_section_length(s: AppState, cmd: SetSectionLength, registry: RegistryProtocol) -> AppState:
+    i = _section_index(s, cmd.section_id)
+    if i < 0:
+        raise ValueError("Unknown section.")
+    _check_length(cmd.length)
+    if s.dirty and s.sections[i].length == cmd.length:
         return s
+    sec = _evolve(s.sections[i], length=cmd.length)
+    return _evolve(s, sections=_with_section(s, i, sec), dirty=True)
 
-    if isinstance(cmd, NextSection):
-        if s.sections:
-            cur_idx = 0
-            if s.active_section_id:
-                for i, sec in enumerate(s.sections):
-                    if sec.id == s.active_section_id:
-                        cur_idx = i
-                        break
-            new_idx = min(len(s.sections) - 1, cur_idx + 1)
-            s.active_section_id = s.sections[new_idx].id
-            s.mode = Mode.SECTION_ACTIVE
+
+# --- PDF navigation (not dirty) ---
+# A target equal to the current value (page at either end, zoom at a bound) returns `s` itself.
+def _nav_page(s: AppState, cmd: NavPage, registry: RegistryProtocol) -> AppState:
+    if s.pdf.page_count > 0:
+        page = max(0, min(s.pdf.page + cmd.delta, s.pdf.page_count - 1))
+        if page != s.pdf.page:
+            s = _evolve(s, pdf=_evolve(s.pdf, page=page))
+    return s
+
+
+def _set_page(s: AppState, cmd: SetPage, registry: RegistryProtocol) -> AppState:
+    if s.pdf.page_count > 0:
+        page = max(0, min(cmd.page, s.pdf.page_count - 1))
+        if page != s.pdf.page:
+            s = _evolve(s, pdf=_evolve(s.pdf, page=page))
+    return s
+
+
+def _set_zoom(s: AppState, cmd: SetZoom, registry: RegistryProtocol) -> AppState:
+    zoom = max(0.25, min(cmd.zoom, 4.0))
+    if zoom == s.pdf.zoom:
         return s
+    return _evolve(s, pdf=_evolve(s.pdf, zoom=zoom))
+
+
+# --- Save acknowledgment ---
+def _mark_saved(s: AppState, cmd: MarkSaved, registry: RegistryProtocol) -> AppState:
+    return _evolve(s, dirty=False, last_autosave_at=cmd.when)
+
 
-    # Unhandled command → no-op (future-proof)
+# --- Section navigation (not dirty) ---
+def _prev_section(s: AppState, cmd: PrevSection, registry: RegistryProtocol) -> AppState:
+    if s.sections:
+        cur_idx = max(0, _section_index(s, s.active_section_id))
+        new_idx = max(0, cur_idx - 1)
+        s = _activate_section(s, new_idx)
     return s
 
 
+def _next_section(s: AppState, cmd: NextSection, registry: RegistryProtocol) -> AppState:
+    if s.sections:
+        cur_idx = max(0, _section_index(s, s.active_section_id))
+        new_idx = min(len(s.sections) - 1, cur_idx + 1)
+        s = _activate_section(s, new_idx)
+    return s
+
+
+_DISPATCH: Dict[Type[Command], Callable[[AppState, Any, RegistryProtocol], AppState]] = {
+    NewSection: _new_section,
+    StartComponent: _start_component,
+    SetFieldValue: _set_field_value,
+    ResetSection: _reset_section,
+    NextField: _next_field,
+    PrevField: _prev_field,
+    CommitComponent: _commit_component,
+    CancelDraft: _cancel_draft,
+    RenameSection: _rename_section,
+    SetSectionLength: _set_section_length,
+    NavPage: _nav_page,
+    SetPage: _set_page,
+    SetZoom: _set_zoom,
+    MarkSaved: _mark_saved,
+    PrevSection: _prev_section,
+    NextSection: _next_section,
+}
+
+
+def _handler_for_subclass(cmd_type: type) -> Optional[Callable[[AppState, Any, RegistryProtocol], AppState]]:
+    """Handler for a subclass of a known command (isinstance semantics); memoized in _DISPATCH."""
+    for base in cmd_type.__mro__[1:]:
+        handler = _DISPATCH.get(base)
+        if handler is not None:
+            _DISPATCH[cmd_type] = handler
+            return handler
+    return None
+
+
 # ----- helpers -----
 
+# Process-wide suffix keeps ids unique even when several are created within the same millisecond
+_ID_COUNTER = itertools.count(1)
+
 def _new_id(prefix: str, n: int) -> str:
-    return f"{prefix}-{n}-{int(time.time()*1000)%1_000_000}"
+    return f"{prefix}-{n}-{next(_ID_COUNTER)}"
 
-def _find_section(s: AppState, section_id: str) -> Optional[SectionState]:
-    for sec in s.sections:
-        if sec.id == section_id:
-            return sec
-    return None
+def _section_index(s: AppState, section_id: Optional[str]) -> int:
+    """Position of the section with `section_id` in s.sections, or -1."""
+    return s.section_position(section_id)
+
+def _evolve(obj: _T, **changes: Any) -> _T:
+    """
+    `dataclasses.replace` for the state dataclasses, without its per-call field
+    introspection and __init__ round trip: shallow-copy the slots, then apply `changes`.
+    Valid because the models have no __post_init__, InitVar or init=False fields.
+    """
+    cls = type(obj)
+    new = object.__new__(cls)
+    for name in _slot_names(cls):
+        setattr(new, name, getattr(obj, name))
+    for name, value in changes.items():
+        setattr(new, name, value)
+    return new
+
+@lru_cache(maxsize=None)
+def _slot_names(cls: type) -> Tuple[str, ...]:
+    """`cls.__slots__` as a tuple, looked up once per class."""
+    return tuple(cls.__slots__)
+
+def _activate_section(s: AppState, i: int) -> AppState:
+    """Make section `i` active (SECTION_ACTIVE mode); `s` itself if it already is."""
+    sec_id = s.sections[i].id
+    if s.active_section_id == sec_id and s.mode == Mode.SECTION_ACTIVE:
+        return s
+    return _evolve(s, active_section_id=sec_id, mode=Mode.SECTION_ACTIVE)
+
+def _with_section(s: AppState, i: int, sec: SectionState) -> List[SectionState]:
+    """New sections list with position `i` replaced; the other sections are shared."""
+    sections = list(s.sections)
+    sections[i] = sec
+    return sections
+
+def _check_length(length: Optional[int]) -> None:
+    """Reject NaN/inf section lengths: they have no JSON representation."""
+    if isinstance(length, float) and not math.isfinite(length):
+        raise ValueError("Section length must be a finite number.")
+
+# Per-registry spec digest: {registry: {type_id: (label, field_sequence, required fields)}}.
+# Specs are fixed once a registry is built (add_aliases only touches aliases).
+_SpecInfo = Tuple[str, Tuple[str, ...], frozenset]
+_SPEC_INFO: "weakref.WeakKeyDictionary[RegistryProtocol, Dict[str, _SpecInfo]]" = weakref.WeakKeyDictionary()
+
+def _spec_info(registry: RegistryProtocol, type_id: str) -> _SpecInfo:
+    per_type = _SPEC_INFO.get(registry)
+    if per_type is None:
+        per_type = _SPEC_INFO[registry] = {}
+    info = per_type.get(type_id)
+    if info is None:
+        spec = registry.get_spec(type_id)
+        info = per_type[type_id] = (
+            spec.get("label", type_id),
+            tuple(map(sys.intern, spec.get("field_sequence", []))),
+            frozenset(map(sys.intern, spec.get("required_fields", []))),
+        )
+    return info
 
 def _all_required_set(draft: EditingDraft, registry: RegistryProtocol) -> bool:
-    spec = registry.get_spec(draft.type_id)
-    req = set(spec.get("required_fields", []))
-    for f in req:
-        if draft.values.get(f, None) is None:
-            return False
-    return True
+    req = _spec_info(registry, draft.type_id)[2]
+    # C-level scan, stops at the first missing value; no per-call set or generator frame
+    return None not in map(draft.values.get, req)
+
+@lru_cache(maxsize=None)
+def _key_set(sequence: Tuple[str, ...]) -> frozenset:
+    return frozenset(sequence)
 
 def _commit_current_draft(s: AppState) -> AppState:
     draft = s.editing
     if not draft:
         return s
-    sec = s.get_active_section()
-    if not sec:
+    i = _section_index(s, s.active_section_id)
+    if i < 0:
         raise ValueError("No active section.")
-    # Ensure all declared base fields exist (optional can be None)
-    for f in draft.base_field_sequence:
-        draft.values.setdefault(f, None)
+    sec = s.sections[i]
+    # shallow copy is enough: draft values are normalized scalars (see SetFieldValue;
+    # test_committed_fields_are_scalars checks every built-in field type)
+    fields = dict(draft.values)
+    # Ensure all declared base fields exist (optional can be None). Drafts from StartComponent
+    # are seeded with exactly these keys, so this is normally one C-level set comparison.
+    base = draft.base_field_sequence
+    if fields.keys() != _key_set(base if isinstance(base, tuple) else tuple(base)):
+        for f in base:
+            fields.setdefault(f, None)
     comp = ComponentState(
         id=_new_id("cmp", len(sec.components) + 1),
         type_id=draft.type_id,
         label=draft.label,
-        fields=copy.deepcopy(draft.values),
+        fields=fields,
         status=CompStatus.COMMITTED,
     )
-    sec.components.append(comp)
-    s.editing = None
-    s.mode = Mode.SECTION_ACTIVE
-    s.dirty = True
-    return s
+    sec = _evolve(sec, components=[*sec.components, comp])
+    return _evolve(
+        s, sections=_with_section(s, i, sec), editing=None,
+        mode=Mode.SECTION_ACTIVE, dirty=True,
+    )
 
 # --- Coil conditional fields: visibility + auto-defaults --------------------
 
-def _coil_visible_fields(sequence: list[str], values: dict) -> list[str]:
+# Interned so the per-keystroke compares below usually resolve on identity
+# (spec field names are interned by _spec_info, type ids by _start_component).
+_COIL = sys.intern("Coil")
+_YES = sys.intern("Yes")
+_NO = sys.intern("No")
+_NONE = sys.intern("None")
+_KITS_INCLUDED = sys.intern("kits_included")
+_KITS_QTY = sys.intern("kits_qty")
+_KITS_MOUNT = sys.intern("kits_mount")
+_CTRL_INCLUDED = sys.intern("controllers_included")
+_CTRL_QTY = sys.intern("controllers_qty")
+_CTRL_MOUNT = sys.intern("controllers_mount")
+
+# type_id -> fields whose value can change that type's visible sequence
+_VISIBILITY_GATES: Dict[str, frozenset] = {
+    _COIL: frozenset({_KITS_INCLUDED, _CTRL_INCLUDED}),
+}
+
+_COIL_HIDE_IF_NO_KITS = frozenset({_KITS_QTY, _KITS_MOUNT})
+_COIL_HIDE_IF_NO_CTRL = frozenset({_CTRL_QTY, _CTRL_MOUNT})
+
+@lru_cache(maxsize=None)
+def _coil_mask(sequence: Tuple[str, ...], kits_yes: bool, ctrl_yes: bool) -> Tuple[str, ...]:
+    """Visible subsequence for one of the 4 (kits, controllers) states; computed once each."""
+    return tuple(
+        f for f in sequence
+        if (kits_yes or f not in _COIL_HIDE_IF_NO_KITS) and (ctrl_yes or f not in _COIL_HIDE_IF_NO_CTRL)
+    )
+
+def _coil_visible_fields(sequence: Sequence[str], values: dict) -> Tuple[str, ...]:
     """
     Filter Coil field_sequence based on current values.
     - If kits_included != 'Yes' → hide kits_qty, kits_mount
     - If controllers_included != 'Yes' → hide controllers_qty, controllers_mount
     """
-    kits_yes = values.get("kits_included") == "Yes"
-    ctrl_yes = values.get("controllers_included") == "Yes"
-
-    def _keep(fname: str) -> bool:
-        if fname in ("kits_qty", "kits_mount") and not kits_yes:
-            return False
-        if fname in ("controllers_qty", "controllers_mount") and not ctrl_yes:
-            return False
-        return True
-
-    return [f for f in sequence if _keep(f)]
+    return _coil_mask(
+        sequence if isinstance(sequence, tuple) else tuple(sequence),
+        values.get(_KITS_INCLUDED) == _YES,
+        values.get(_CTRL_INCLUDED) == _YES,
+    )
 
 
-def _maybe_recompute_visible_sequence(type_id: str, base_sequence: list[str], values: dict) -> list[str]:
+def _maybe_recompute_visible_sequence(type_id: str, base_sequence: Sequence[str], values: dict) -> Sequence[str]:
     """Central hook: per-type dynamic sequence filtering (always from canonical base)."""
-    if type_id == "Coil":
+    if type_id == _COIL:
         return _coil_visible_fields(base_sequence, values)
     return base_sequence
 
@@ -320,18 +470,18 @@ def _coil_apply_auto_values(values: dict, changed_field: str, new_val: Any):
     - kits_included: 'No' → kits_qty=0, kits_mount='None'; 'Yes' → clear (None, None)
     - controllers_included: same logic
     """
-    if changed_field == "kits_included":
-        if new_val == "No":
-            values["kits_qty"] = 0
-            values["kits_mount"] = "None"
-        elif new_val == "Yes":
-            values["kits_qty"] = None
-            values["kits_mount"] = None
-
-    elif changed_field == "controllers_included":
-        if new_val == "No":
-            values["controllers_qty"] = 0
-            values["controllers_mount"] = "None"
-        elif new_val == "Yes":
-            values["controllers_qty"] = None
-            values["controllers_mount"] = None
+    if changed_field == _KITS_INCLUDED:
+        if new_val == _NO:
+            values[_KITS_QTY] = 0
+            values[_KITS_MOUNT] = _NONE
+        elif new_val == _YES:
+            values[_KITS_QTY] = None
+            values[_KITS_MOUNT] = None
+
+    elif changed_field == _CTRL_INCLUDED:
+        if new_val == _NO:
+            values[_CTRL_QTY] = 0
+            values[_CTRL_MOUNT] = _NONE
+        elif new_val == _YES:
+            values[_CTRL_QTY] = None
+            values[_CTRL_MOUNT] = None
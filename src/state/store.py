@@ -1,7 +1,7 @@
 from __future__ import annotations
+from collections import deque
 from dataclasses import dataclass, field
-from typing import List
-import copy
+from typing import Deque
 
 from .model import AppState
 from .commands import Command
@@ -14,6 +14,17 @@ class Store:
     """
     Small wrapper around the pure reducer with undo/redo snapshots.
 
+    `revision` increases on every state change (apply/undo/redo/touch), so
+    callers can cache work derived from the state. `data_revision` only moves
+    when the exported data can have changed (sections, meta, PDF path, or a
+    touch()), not on page turns, zoom or mode changes: key exports on it.
+
+    History holds states by reference: reduce() never mutates its input, so a
+    snapshot costs nothing. In-place edits of `state.pdf` / `state.meta` (UI
+    bookkeeping, followed by touch()) are not undoable and may show through in
+    snapshots that share those objects. Undo/redo keep at most `max_history`
+    states each; the oldest ones are dropped first.
+
     Usage:
         store = Store(registry=my_registry)
         store.apply(NewSection(...))
@@ -21,29 +32,54 @@ class Store:
     """
     state: AppState = field(default_factory=AppState)
     registry: RegistryProtocol = field(default=None)  # inject at construction
-    _undo: List[AppState] = field(default_factory=list)
-    _redo: List[AppState] = field(default_factory=list)
+    revision: int = 0
+    data_revision: int = 0
+    max_history: int = 200
+    _undo: Deque[AppState] = field(init=False, repr=False)
+    _redo: Deque[AppState] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._undo = deque(maxlen=self.max_history)
+        self._redo = deque(maxlen=self.max_history)
 
     def apply(self, cmd: Command) -> AppState:
-        self._undo.append(copy.deepcopy(self.state))
+        new = reduce(self.state, cmd, self.registry)
+        if new is self.state:
+            # no-op (clamped page, same zoom, ...): no undo step, and `state` must never
+            # alias the last snapshot, or in-place UI edits would rewrite it
+            return new
+        self._undo.append(self.state)
         self._redo.clear()
-        self.state = reduce(self.state, cmd, self.registry)
-        return self.state
+        self._set(new)
+        return new
 
     def undo(self) -> AppState:
         if not self._undo:
             return self.state
-        self._redo.append(copy.deepcopy(self.state))
-        self.state = self._undo.pop()
+        self._redo.append(self.state)
+        self._set(self._undo.pop())
         return self.state
 
     def redo(self) -> AppState:
         if not self._redo:
             return self.state
-        self._undo.append(copy.deepcopy(self.state))
-        self.state = self._redo.pop()
+        self._undo.append(self.state)
+        self._set(self._redo.pop())
         return self.state
 
+    def touch(self) -> None:
+        """Record an out-of-band mutation of `state` (e.g. UI-set meta)."""
+        self.revision += 1
+        self.data_revision += 1
+
+    def _set(self, new: AppState) -> None:
+        old, self.state = self.state, new
+        self.revision += 1
+        # reduce() replaces `sections` whenever a section or component changes
+        if (new.sections is not old.sections or new.meta is not old.meta
+                or new.pdf.path != old.pdf.path):
+            self.data_revision += 1
+
     def clear_history(self) -> None:
         self._undo.clear()
         self._redo.clear()
@@ -3,8 +3,10 @@ from __future__ import annotations
 
 import sys
 import time
+import unicodedata
+from collections import deque
 from dataclasses import dataclass
-from typing import Optional, List, Tuple
+from typing import Callable, Deque, Dict, Iterable, Iterator, Optional, List, Tuple
 
 from PySide6 import QtCore, QtGui, QtWidgets
 from PySide6.QtCore import Qt
@@ -13,10 +15,11 @@ from registry import PluginRegistry
 from state import (
     Store, Mode,
     NewSection, StartComponent, SetFieldValue, NextField, PrevField,
-    CancelDraft, NavPage, SetZoom, MarkSaved, SetSectionLength, ResetSection
+    CancelDraft, NavPage, SetZoom, MarkSaved, SetSectionLength, ResetSection,
+    PrevSection, NextSection,
 )
 from pdfio import PdfIO
-from dimension_extractor import analyze_page
+from dimension_extractor import PageAnalyzer
 from types import SimpleNamespace
 from pathlib import Path
 
@@ -89,13 +92,74 @@ class HudModel:
     no_match: bool
     # NEW: visual cue when section length not set
     awaiting_length: bool
+    # `hints` joined for display (set by whoever sets `hints`)
+    hints_display: str = ""
 
 
 class PromptBuilder:
     def __init__(self, registry: PluginRegistry):
         self.registry = registry
+        # Spec-derived HUD text is static per type/field: computed once, reused every refresh
+        # (specs are fixed once a registry is built; add_aliases only touches aliases)
+        self._spec_cache: Dict[str, Tuple[str, Dict[str, dict]]] = {}
+        self._hint_cache: Dict[Tuple[str, str], Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]] = {}
 
-    def build(self, state, token_buffer: Optional[str], toasts: List[str], field_buffer: str = "") -> HudModel:
+    @staticmethod
+    def _fold(s: str) -> str:
+        """lower + strip diacritics for prefix comparison."""
+        s = unicodedata.normalize("NFD", s)
+        s = "".join(c for c in s if unicodedata.category(c) != "Mn")
+        return s.casefold()
+
+    def _spec_for(self, type_id: str) -> Tuple[str, Dict[str, dict]]:
+        """(label, field defs by name) for `type_id`, looked up once."""
+        cached = self._spec_cache.get(type_id)
+        if cached is None:
+            spec = self.registry.get_spec(type_id)
+            cached = self._spec_cache[type_id] = (spec.get("label", type_id), spec.get("fields", {}))
+        return cached
+
+    def _hints_for(self, type_id: str, fname: str) -> Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]:
+        """
+        (labels, folded labels, static hints) for one field. Labels are the full
+        enum/bool option labels (empty for other types); for those the static hint
+        is the "Options: ..." line, otherwise the int range / type hint.
+        """
+        key = (type_id, fname)
+        cached = self._hint_cache.get(key)
+        if cached is not None:
+            return cached
+
+        fdef = self._spec_for(type_id)[1].get(fname, {})
+        ftype = fdef.get("type", "enum")
+
+        # Always display full labels for enum/bool
+        labels: Tuple[str, ...] = ()
+        if ftype == "bool":
+            labels = ("Yes", "No")
+        elif ftype == "enum":
+            # unique-preserving
+            labels = tuple(dict.fromkeys(fdef.get("map", {}).values()))
+
+        if labels:
+            hints = ("Options: " + " / ".join(labels),)
+        elif ftype == "int":
+            minv = fdef.get("min"); maxv = fdef.get("max")
+            if minv is not None and maxv is not None:
+                hints = (f"[{minv}..{maxv}]",)
+            elif minv is not None:
+                hints = (f"≥ {minv}",)
+            elif maxv is not None:
+                hints = (f"≤ {maxv}",)
+            else:
+                hints = ("int",)
+        else:
+            hints = (ftype,)
+
+        cached = self._hint_cache[key] = (labels, tuple(map(self._fold, labels)), hints)
+        return cached
+
+    def build(self, state, token_buffer: Optional[List[str]], toasts: List[str], field_buffer: str = "") -> HudModel:
         # Title + fields + hints
         title = ""
         fields: List[FieldChip] = []
@@ -106,8 +170,7 @@ class PromptBuilder:
         no_match = False
 
         if state.mode == Mode.FIELD_EDITING and state.editing:
-            spec = self.registry.get_spec(state.editing.type_id)
-            title = spec.get("label", state.editing.type_id)
+            title = self._spec_for(state.editing.type_id)[0]
             seq = state.editing.field_sequence
             idx = state.editing.index
             for i, fname in enumerate(seq):
@@ -116,30 +179,15 @@ class PromptBuilder:
 
             # Hints for the active field
             if 0 <= idx < len(seq):
-                fdef = spec.get("fields", {}).get(seq[idx], {})
-                ftype = fdef.get("type", "enum")
-
-                # Always display full labels for enum/bool
-                def _labels_for():
-                    if ftype == "bool":
-                        return ["Yes", "No"]
-                    if ftype == "enum":
-                        # unique-preserving
-                        return list(dict.fromkeys(fdef.get("map", {}).values()))
-                    return []
-
-                labels = _labels_for()
+                labels, folded, static_hints = self._hints_for(state.editing.type_id, seq[idx])
+                # Options line (or the int range / type hint)
+                hints = list(static_hints)
                 if labels:
                     # Visual matching of buffer
-                    def _fold(s: str) -> str:
-                        import unicodedata as _ud
-                        s = _ud.normalize("NFD", s)
-                        s = "".join(c for c in s if _ud.category(c) != "Mn")
-                        return s.casefold()
-                    fb = _fold(field_buffer) if field_buffer else ""
+                    fb = self._fold(field_buffer) if field_buffer else ""
                     matches = []
-                    for L in labels:
-                        if fb and _fold(L).startswith(fb):
+                    for L, fL in zip(labels, folded):
+                        if fb and fL.startswith(fb):
                             matches.append(L)
                             options_visual.append((L, len(field_buffer)))
                         else:
@@ -153,21 +201,6 @@ class PromptBuilder:
                             no_match = True
                             hints.append("no match")
                         hints.append(f"typed: {field_buffer}▎")
-                    # Options line
-                    hints.insert(0, "Options: " + " / ".join(labels))
-
-                elif ftype == "int":
-                    minv = fdef.get("min"); maxv = fdef.get("max")
-                    if minv is not None and maxv is not None:
-                        hints = [f"[{minv}..{maxv}]"]
-                    elif minv is not None:
-                        hints = [f"≥ {minv}"]
-                    elif maxv is not None:
-                        hints = [f"≤ {maxv}"]
-                    else:
-                        hints = ["int"]
-                else:
-                    hints = [ftype]
         else:
             # Not editing: show section or generic prompt
             if state.sections and state.active_section_id:
@@ -177,7 +210,7 @@ class PromptBuilder:
                 title = "No sections — press Enter to create one"
 
             if token_buffer:
-                token_ui = "token: " + " ".join(list(token_buffer)) + " ▎"
+                token_ui = "token: " + " ".join(token_buffer) + " ▎"
 
         # footer info
         pc = max(1, state.pdf.page_count) if state.pdf else 1
@@ -195,6 +228,7 @@ class PromptBuilder:
             title=title,
             fields=fields,
             hints=hints,
+            hints_display=" • ".join(hints),
             token_ui=token_ui,
             foot=foot,
             toasts=toasts[-3:],  # show up to last 3
@@ -218,17 +252,84 @@ class HUDOverlay(QtWidgets.QWidget):
         self.setAttribute(QtCore.Qt.WA_NoSystemBackground)
         self.setAttribute(QtCore.Qt.WA_TranslucentBackground)
         self._model: Optional[HudModel] = None
+        self._pixmap: Optional[QtGui.QPixmap] = None  # last render of _model; None = stale
         # UI scale: +15% for the HUD and toasts
         self._scale = 1.15
 
+        # Paint resources, built once (the HUD repaints on every key and toast tick)
+        self._no_pen = QtGui.QPen(QtCore.Qt.NoPen)
+        self._c_panel_bg = QtGui.QColor(20, 20, 24, 190)
+        self._c_panel_awaiting = QtGui.QColor(30, 90, 200, 180)
+        self._c_text = QtGui.QColor(240, 240, 240)
+        self._c_chip_bg = QtGui.QColor(60, 60, 70, 230)
+        self._c_chip_active = QtGui.QColor(90, 110, 170, 230)
+        self._c_hint = QtGui.QColor(200, 200, 210)
+        self._c_option_bg = QtGui.QColor(55, 55, 65, 210)
+        self._pen_option = QtGui.QPen(QtGui.QColor(235, 235, 240))
+        self._pen_option_prefix = QtGui.QPen(QtGui.QColor(255, 255, 255))
+        self._c_token = QtGui.QColor(220, 220, 230)
+        self._c_foot = QtGui.QColor(180, 180, 190)
+        self._c_toast_bg = QtGui.QColor(30, 120, 60, 220)
+        self._c_toast_text = QtGui.QColor(250, 250, 250)
+        self._build_fonts()
+
+    def _build_fonts(self) -> None:
+        """Derive the HUD fonts from the widget font (the painter's starting font)."""
+        S = self._scale
+
+        def font(size: float, bold: bool = False, underline: bool = False) -> QtGui.QFont:
+            f = QtGui.QFont(self.font())
+            f.setPointSizeF(size * S)
+            f.setBold(bold)
+            f.setUnderline(underline)
+            return f
+
+        self._font_title = font(11.5, bold=True)
+        self._font_chip = font(10.5)
+        # hints / options inherit the title's bold when no fields line was drawn
+        self._font_chip_bold = font(10.5, bold=True)
+        self._font_hint = font(10)
+        self._font_hint_bold = font(10, bold=True)
+        self._font_option_prefix = font(10.5, bold=True, underline=True)
+        self._font_foot = font(9.5)
+        self._font_toast = self._font_chip
+        self._font_mono = QtGui.QFont("Monospace")
+        self._font_mono.setStyleHint(QtGui.QFont.TypeWriter)
+        self._font_mono.setPointSizeF(10 * S)
+
+    def changeEvent(self, event: QtCore.QEvent) -> None:
+        if event.type() == QtCore.QEvent.FontChange:
+            self._build_fonts()
+            self._pixmap = None
+        super().changeEvent(event)
+
+    def resizeEvent(self, event: QtGui.QResizeEvent) -> None:
+        self._pixmap = None  # layout depends on the widget size
+        super().resizeEvent(event)
+
     def set_model(self, model: HudModel):
         self._model = model
+        self._pixmap = None
         self.update()
 
     def paintEvent(self, event: QtGui.QPaintEvent) -> None:
         if not self._model:
             return
+        # Repaints without a model change (canvas scroll/zoom underneath) just blit the last render
+        dpr = self.devicePixelRatioF()
+        if self._pixmap is None or self._pixmap.devicePixelRatio() != dpr:
+            pm = QtGui.QPixmap(self.size() * dpr)
+            pm.setDevicePixelRatio(dpr)
+            pm.fill(QtCore.Qt.transparent)
+            painter = QtGui.QPainter(pm)
+            self._render(painter)
+            painter.end()
+            self._pixmap = pm
         p = QtGui.QPainter(self)
+        p.drawPixmap(0, 0, self._pixmap)
+
+    def _render(self, p: QtGui.QPainter) -> None:
+        """Draw the HUD for the current model (into the cached pixmap)."""
         p.setRenderHints(QtGui.QPainter.Antialiasing | QtGui.QPainter.TextAntialiasing)
 
         S = self._scale
@@ -243,13 +344,8 @@ class HUDOverlay(QtWidgets.QWidget):
 
         # Background (light green if awaiting length)
         panel_rect = QtCore.QRectF(x, y, panel_w, panel_h)
-        if self._model.awaiting_length:
-            # light green glass
-            bg = QtGui.QColor(30, 90, 200, 180)
-        else:
-            bg = QtGui.QColor(20, 20, 24, 190)
-        p.setBrush(bg)
-        p.setPen(QtCore.Qt.NoPen)
+        p.setBrush(self._c_panel_awaiting if self._model.awaiting_length else self._c_panel_bg)
+        p.setPen(self._no_pen)
         p.drawRoundedRect(panel_rect, 10, 10)
 
         # Text metrics
@@ -259,48 +355,47 @@ class HUDOverlay(QtWidgets.QWidget):
 
         # Title
         title = self._model.title
-        p.setPen(QtGui.QColor(240, 240, 240))
-        font = p.font()
-        font.setPointSizeF(11.5 * S)
-        font.setBold(True)
-        p.setFont(font)
+        p.setPen(self._c_text)
+        p.setFont(self._font_title)
         p.drawText(QtCore.QPointF(text_x, cur_y + int(18 * S)), title)
         cur_y += int(26 * S)
 
         # Fields line
         if self._model.fields:
-            font.setBold(False)
-            font.setPointSizeF(10.5 * S)
-            p.setFont(font)
+            p.setFont(self._font_chip)
+            fm = p.fontMetrics()
+            chip_pad, chip_h = int(16 * S), int(24 * S)
+            rect = QtCore.QRectF()  # reused for every chip
             seg_x = text_x
             for chip in self._model.fields:
                 label = f"{chip.name} = {chip.value}"
-                rect = QtCore.QRectF(seg_x, cur_y, p.fontMetrics().horizontalAdvance(label) + int(16 * S), int(24 * S))
+                rect.setRect(seg_x, cur_y, fm.horizontalAdvance(label) + chip_pad, chip_h)
                 # chip bg
-                bg_chip = QtGui.QColor(60, 60, 70, 230) if not chip.active else QtGui.QColor(90, 110, 170, 230)
-                p.setBrush(bg_chip)
-                p.setPen(QtCore.Qt.NoPen)
+                p.setBrush(self._c_chip_active if chip.active else self._c_chip_bg)
+                p.setPen(self._no_pen)
                 p.drawRoundedRect(rect, 6, 6)
                 # chip text
-                p.setPen(QtGui.QColor(240, 240, 240))
+                p.setPen(self._c_text)
                 p.drawText(QtCore.QPointF(rect.x() + int(8 * S), rect.y() + int(17 * S)), label)
                 seg_x += rect.width() + int(8 * S)
             cur_y += int(32 * S)
 
         # Hints
         if self._model.hints:
-            hints = " • ".join(self._model.hints)
-            p.setPen(QtGui.QColor(200, 200, 210))
-            font.setPointSizeF(10 * S)
-            p.setFont(font)
+            hints = self._model.hints_display
+            p.setPen(self._c_hint)
+            p.setFont(self._font_hint if self._model.fields else self._font_hint_bold)
             p.drawText(QtCore.QPointF(text_x, cur_y + int(18 * S)), f"Hints: {hints}")
             cur_y += int(24 * S)
 
         # Options visual line (labels with prefix underlined/bold)
         if self._model.options_visual:
-            font = p.font()
-            font.setPointSizeF(10.5 * S)
+            font = self._font_chip if self._model.fields else self._font_chip_bold
             p.setFont(font)
+            fm = p.fontMetrics()
+            fm_prefix = None  # only needed once a prefix matches
+            pill_pad, pill_h = int(20 * S), int(26 * S)
+            rect = QtCore.QRectF()  # reused for every pill
             seg_x = text_x
             gap = int(16 * S)
             for label, pref_len in self._model.options_visual:
@@ -308,25 +403,21 @@ class HUDOverlay(QtWidgets.QWidget):
                 prefix = label[:pref_len]
                 rest = label[pref_len:]
                 # draw pill
-                lab_w = p.fontMetrics().horizontalAdvance(label) + int(20 * S)
-                rect = QtCore.QRectF(seg_x, cur_y, lab_w, int(26 * S))
-                bg = QtGui.QColor(55, 55, 65, 210)
-                p.setBrush(bg)
-                p.setPen(QtCore.Qt.NoPen)
+                rect.setRect(seg_x, cur_y, fm.horizontalAdvance(label) + pill_pad, pill_h)
+                p.setBrush(self._c_option_bg)
+                p.setPen(self._no_pen)
                 p.drawRoundedRect(rect, 6, 6)
                 # text
                 x0 = rect.x() + int(10 * S)
                 y0 = rect.y() + int(18 * S)
-                pen_norm = QtGui.QPen(QtGui.QColor(235, 235, 240))
-                pen_emph = QtGui.QPen(QtGui.QColor(255, 255, 255))
+                pen_norm = self._pen_option
                 # prefix bold/underline
                 if pref_len > 0:
-                    f_b = QtGui.QFont(p.font())
-                    f_b.setBold(True)
-                    f_b.setUnderline(True)
-                    p.setFont(f_b); p.setPen(pen_emph)
+                    p.setFont(self._font_option_prefix); p.setPen(self._pen_option_prefix)
                     p.drawText(QtCore.QPointF(x0, y0), prefix)
-                    w_pref = p.fontMetrics().horizontalAdvance(prefix)
+                    if fm_prefix is None:
+                        fm_prefix = p.fontMetrics()
+                    w_pref = fm_prefix.horizontalAdvance(prefix)
                     p.setFont(font); p.setPen(pen_norm)
                     p.drawText(QtCore.QPointF(x0 + w_pref, y0), rest)
                 else:
@@ -337,36 +428,33 @@ class HUDOverlay(QtWidgets.QWidget):
 
         # Token line
         if self._model.token_ui:
-            p.setPen(QtGui.QColor(220, 220, 230))
-            mono = QtGui.QFont("Monospace")
-            mono.setStyleHint(QtGui.QFont.TypeWriter)
-            mono.setPointSizeF(10 * S)
-            p.setFont(mono)
+            p.setPen(self._c_token)
+            p.setFont(self._font_mono)
             p.drawText(QtCore.QPointF(text_x, cur_y + int(18 * S)), self._model.token_ui)
 
         # Footer (page/zoom)
-        p.setPen(QtGui.QColor(180, 180, 190))
-        font.setPointSizeF(9.5 * S)
-        font.setBold(False)
-        p.setFont(font)
+        p.setPen(self._c_foot)
+        p.setFont(self._font_foot)
         p.drawText(QtCore.QPointF(x + pad, y + panel_h - int(10 * S)), self._model.foot)
 
         # Toasts (top-right) — 15% larger
         tx = self.width() - int(16 * S)
         ty = int(16 * S)
         toast_h = int(30 * S)
-        font_toast = QtGui.QFont(p.font())
-        font_toast.setPointSizeF(10.5 * S)
+        step = toast_h + int(8 * S)
+        text_dx, text_dy = int(10 * S), int(20 * S)
+        # same size for every toast: one rect, moved down per message
+        rect = QtCore.QRectF(0, 0, min(int(380 * S), self.width() - int(32 * S)), toast_h)
+        corner = QtCore.QPointF(tx, ty)
+        p.setBrush(self._c_toast_bg)
+        p.setFont(self._font_toast)
         for msg in self._model.toasts:
-            rect = QtCore.QRectF(0, 0, min(int(380 * S), self.width() - int(32 * S)), toast_h)
-            rect.moveTopRight(QtCore.QPointF(tx, ty))
-            p.setBrush(QtGui.QColor(30, 120, 60, 220))   # blue
-            p.setPen(QtCore.Qt.NoPen)
+            rect.moveTopRight(corner)
+            p.setPen(self._no_pen)
             p.drawRoundedRect(rect, 8, 8)
-            p.setPen(QtGui.QColor(250, 250, 250))
-            p.setFont(font_toast)
-            p.drawText(QtCore.QPointF(rect.x() + int(10 * S), rect.y() + int(20 * S)), msg)
-            ty += rect.height() + int(8 * S)
+            p.setPen(self._c_toast_text)
+            p.drawText(QtCore.QPointF(rect.x() + text_dx, rect.y() + text_dy), msg)
+            corner.setY(corner.y() + step)
 
 
 # -------------------------
@@ -402,9 +490,8 @@ class PdfCanvas(QtWidgets.QWidget):
         if img.isNull():
             self._draw_placeholder(painter); return
 
-        # draw at native logical size (Qt accounts for DPR)
-        iw = int(img.width() / img.devicePixelRatio())
-        ih = int(img.height() / img.devicePixelRatio())
+        # draw at native logical size (Qt accounts for DPR); computed once per render by PdfIO
+        iw, ih = self.pdf.logical_size()
         vw, vh = self.width(), self.height()
 
         x = (vw - iw) // 2
@@ -468,108 +555,109 @@ class PdfCanvas(QtWidgets.QWidget):
 # KeyRouter (mode-aware)
 # -------------------------
 
+# Key codes / modifiers bound once: route() runs on every key press
+_CTRL = QtCore.Qt.ControlModifier
+_SHIFT = QtCore.Qt.ShiftModifier
+_KEY_R, _KEY_O, _KEY_S, _KEY_P, _KEY_N = (int(k) for k in (Qt.Key_R, Qt.Key_O, Qt.Key_S, Qt.Key_P, Qt.Key_N))
+_KEY_Z, _KEY_Y, _KEY_0 = (int(k) for k in (Qt.Key_Z, Qt.Key_Y, Qt.Key_0))
+_KEY_TAB, _KEY_BACKTAB = int(Qt.Key_Tab), int(Qt.Key_Backtab)
+_KEY_BACKSPACE, _KEY_ESCAPE = int(Qt.Key_Backspace), int(Qt.Key_Escape)
+_KEY_RETURN, _KEY_ENTER = int(Qt.Key_Return), int(Qt.Key_Enter)
+_KEYS_ZOOM_IN = tuple(int(k) for k in (Qt.Key_Plus, Qt.Key_Equal, Qt.Key_Up, Qt.Key_BracketRight))
+_KEYS_ZOOM_OUT = tuple(int(k) for k in (Qt.Key_Minus, Qt.Key_Down, Qt.Key_BracketLeft))
+
+
+def _zoom_in(state) -> Action:
+    cur = state.pdf.zoom if state.pdf else 1.0
+    return Action(Action.SET_ZOOM, min(cur * 1.1, 4.0))
+
+
+def _zoom_out(state) -> Action:
+    cur = state.pdf.zoom if state.pdf else 1.0
+    return Action(Action.SET_ZOOM, max(cur / 1.1, 0.25))
+
+
 class KeyRouter:
-    """Translate raw key events into Actions, with global + mode-specific priority."""
+    """
+    Translate raw key events into Actions, with global + mode-specific priority.
+
+    Fixed bindings are jump tables: key code -> handler(state, shift, token_active),
+    returning an Action, or None to fall through to the next table / printable-text tail.
+    """
+
+    # Ctrl + key (global, always first)
+    _CTRL_TABLE: Dict[int, Callable[..., Optional[Action]]] = {
+        # Full restart: Ctrl+R; section-only reset: Ctrl+Shift+R
+        _KEY_R: lambda st, shift, tok: Action(Action.RESET_SECTION if shift else Action.START_OVER),
+        _KEY_O: lambda st, shift, tok: Action(Action.OPEN_PDF),
+        _KEY_S: lambda st, shift, tok: Action(Action.SAVE),
+        _KEY_P: lambda st, shift, tok: Action(Action.NAV_PAGE, -1),
+        _KEY_N: lambda st, shift, tok: Action(Action.NAV_PAGE, +1),
+        # Zoom in aliases: Ctrl + (+) OR (=) OR Up Arrow OR ]  (so Ctrl+Up zooms, not PREV_SECTION)
+        **dict.fromkeys(_KEYS_ZOOM_IN, lambda st, shift, tok: _zoom_in(st)),
+        # Zoom out aliases: Ctrl + (-) OR Down Arrow OR [
+        **dict.fromkeys(_KEYS_ZOOM_OUT, lambda st, shift, tok: _zoom_out(st)),
+        # Reset to 100%
+        _KEY_0: lambda st, shift, tok: Action(Action.SET_ZOOM, 1.0),
+        _KEY_Z: lambda st, shift, tok: Action(Action.UNDO),
+        _KEY_Y: lambda st, shift, tok: Action(Action.REDO),
+    }
+
+    # FIELD_EDITING (type-ahead editing behaviour)
+    _FIELD_TABLE: Dict[int, Callable[..., Optional[Action]]] = {
+        _KEY_TAB: lambda st, shift, tok: Action(Action.PREV_FIELD if shift else Action.NEXT_FIELD),
+        _KEY_BACKTAB: lambda st, shift, tok: Action(Action.PREV_FIELD),
+        _KEY_BACKSPACE: lambda st, shift, tok: Action(Action.FIELDBUF_BACKSPACE),
+        _KEY_ESCAPE: lambda st, shift, tok: Action(Action.FIELDBUF_CLEAR),
+    }
+
+    # SECTION_ACTIVE (and IDLE behaves the same for MVP); only reached without Ctrl for P/N
+    _SECTION_TABLE: Dict[int, Callable[..., Optional[Action]]] = {
+        # plain 'p' / 'n': previous / next PDF, unless typing a token
+        _KEY_P: lambda st, shift, tok: None if tok else Action(Action.PREV_PDF),
+        _KEY_N: lambda st, shift, tok: None if tok else Action(Action.NEXT_PDF),
+        # If in token typing, submit token. Otherwise create new section.
+        _KEY_RETURN: lambda st, shift, tok: Action(Action.TOKEN_SUBMIT if tok else Action.NEW_SECTION),
+        _KEY_ENTER: lambda st, shift, tok: Action(Action.TOKEN_SUBMIT if tok else Action.NEW_SECTION),
+        _KEY_ESCAPE: lambda st, shift, tok: Action(Action.TOKEN_CLEAR) if tok else None,
+        _KEY_BACKSPACE: lambda st, shift, tok: Action(Action.TOKEN_BACKSPACE) if tok else None,
+    }
 
-    def route(self, state, event: QtGui.QKeyEvent, token_active: bool) -> Action:
+    @staticmethod
+    def route(state, event: QtGui.QKeyEvent, token_active: bool) -> Action:
         key = event.key()
         mods = event.modifiers()
-        text = event.text() or ""
+        ctrl = bool(mods & _CTRL)
+        shift = bool(mods & _SHIFT)
 
         # --- Global shortcuts (always) ---
-        # inside KeyRouter.route, under "Global shortcuts"
-        if mods & QtCore.Qt.ControlModifier:
-            # Full restart: Ctrl+R
-            if key == QtCore.Qt.Key_R and not (mods & QtCore.Qt.ShiftModifier):
-                return Action(Action.START_OVER)
-            # Section-only reset: Ctrl+Shift+R
-            if (mods & QtCore.Qt.ShiftModifier) and key == QtCore.Qt.Key_R:
-                return Action(Action.RESET_SECTION)
-
-                # (If you ever add Ctrl+R variations, handle them here.)
-            if key in (QtCore.Qt.Key_O,):
-                return Action(Action.OPEN_PDF)
-            if key in (QtCore.Qt.Key_S,):
-                return Action(Action.SAVE)
-            if key in (QtCore.Qt.Key_P,):
-                return Action(Action.NAV_PAGE, -1)
-            if key in (QtCore.Qt.Key_N,):
-                return Action(Action.NAV_PAGE, +1)
-            # Zoom in aliases: Ctrl + (+) OR (=) OR Up Arrow OR ]
-            if key in (
-                QtCore.Qt.Key_Plus,
-                QtCore.Qt.Key_Equal,
-                QtCore.Qt.Key_Up,
-                QtCore.Qt.Key_BracketRight,
-            ):
-                cur = state.pdf.zoom if state.pdf else 1.0
-                return Action(Action.SET_ZOOM, min(cur * 1.1, 4.0))
-
-            # Zoom out aliases: Ctrl + (-) OR Down Arrow OR [
-            if key in (
-                QtCore.Qt.Key_Minus,
-                QtCore.Qt.Key_Down,
-                QtCore.Qt.Key_BracketLeft,
-            ):
-                cur = state.pdf.zoom if state.pdf else 1.0
-                return Action(Action.SET_ZOOM, max(cur / 1.1, 0.25))
-
-            # Reset to 100%
-            if key in (QtCore.Qt.Key_0,):
-                return Action(Action.SET_ZOOM, 1.0)
-
-            if key in (QtCore.Qt.Key_Z,):
-                return Action(Action.UNDO)
-            if key in (QtCore.Qt.Key_Y,):
-                return Action(Action.REDO)
-            if key == QtCore.Qt.Key_Up:
-                return Action(Action.PREV_SECTION)
-            if key == QtCore.Qt.Key_Down:
-                return Action(Action.NEXT_SECTION)
+        if ctrl:
+            handler = KeyRouter._CTRL_TABLE.get(key)
+            if handler is not None:
+                return handler(state, shift, token_active)
 
         # --- Mode-specific: FIELD_EDITING ---
         if state.mode == Mode.FIELD_EDITING:
-            if key == QtCore.Qt.Key_Tab and not (mods & QtCore.Qt.ShiftModifier):
-                return Action(Action.NEXT_FIELD)
-            if key == QtCore.Qt.Key_Backtab or (key == QtCore.Qt.Key_Tab and (mods & QtCore.Qt.ShiftModifier)):
-                return Action(Action.PREV_FIELD)
-            # Type-ahead editing behaviour
-            if key == QtCore.Qt.Key_Backspace:
-                return Action(Action.FIELDBUF_BACKSPACE)
-            if key == QtCore.Qt.Key_Escape:
-                return Action(Action.FIELDBUF_CLEAR)
+            handler = KeyRouter._FIELD_TABLE.get(key)
+            if handler is not None:
+                return handler(state, shift, token_active)
             # Character input for current field (passes to type-ahead / numeric handler in dispatcher)
-            if text and not (mods & QtCore.Qt.ControlModifier):
+            text = event.text()
+            if text and not ctrl:
                 ch = text.strip()
                 if ch:
                     return Action(Action.FIELDBUF_APPEND, ch)
             return Action(Action.NOOP)
 
-
-        if key == QtCore.Qt.Key_P and not (mods & QtCore.Qt.ControlModifier) and not token_active:
-            return Action(Action.PREV_PDF)
-
-        # --- Next PDF (plain 'n') ---
-        # Only when NOT editing a field and NOT typing a token
-        if key == QtCore.Qt.Key_N and not (mods & QtCore.Qt.ControlModifier) and not token_active:
-            return Action(Action.NEXT_PDF)
-
-        # --- SECTION_ACTIVE (and IDLE behaves the same for MVP) ---
-        if key in (QtCore.Qt.Key_Return, QtCore.Qt.Key_Enter):
-            # If in token typing, submit token. Otherwise create new section.
-            if token_active:
-                return Action(Action.TOKEN_SUBMIT)
-            return Action(Action.NEW_SECTION)
-
-        if key == QtCore.Qt.Key_Escape and token_active:
-            return Action(Action.TOKEN_CLEAR)
-
-        # just before token typing section (and after FIELD_EDITING block)
-        if token_active and key == QtCore.Qt.Key_Backspace:
-            return Action(Action.TOKEN_BACKSPACE)
+        handler = KeyRouter._SECTION_TABLE.get(key)
+        if handler is not None:
+            action = handler(state, shift, token_active)
+            if action is not None:
+                return action
 
         # Token typing: accept letters/digits/_-
-        if text and text.isprintable() and not (mods & QtCore.Qt.ControlModifier):
+        text = event.text()
+        if text and text.isprintable() and not ctrl:
             ch = text.strip()
             if ch:
                 # Start or append token while in SECTION_ACTIVE
@@ -592,12 +680,21 @@ class UIApp(QtWidgets.QMainWindow):
         self.pdf = PdfIO(cache_pages=12, workers=2)
 
         # Token builder & toasts
-        self._token_buffer: Optional[str] = None
-        self._toasts: List[Tuple[str, float]] = []  # (message, expires_at)
+        self._token_buffer: Optional[List[str]] = None  # typed characters; None when not typing a token
+        # live toasts, oldest first, as parallel queues: message / expiry time
+        self._toast_msgs: Deque[str] = deque()
+        self._toast_expiry: Deque[float] = deque()
         self._toast_timer = QtCore.QTimer(self)
         self._toast_timer.setInterval(200)
-        self._toast_timer.timeout.connect(self._prune_toasts)
-        self._toast_timer.start()
+        self._toast_timer.timeout.connect(self._prune_toasts)  # runs only while toasts are shown
+
+        # HUD rebuilds are deferred to the next event-loop turn: a burst of actions
+        # (key repeat, fast typing) builds the model once
+        self._refresh_timer = QtCore.QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(0)
+        self._refresh_timer.timeout.connect(self._do_refresh_hud)
+        self._last_hud_key: Optional[Tuple[Store, tuple]] = None  # (store, inputs of the last HUD build)
 
         self._on_before_next_pdf = None
 
@@ -612,6 +709,7 @@ class UIApp(QtWidgets.QMainWindow):
         self._fieldbuf_timer.timeout.connect(self._on_fieldbuf_timeout)
         self._pdf_list: list[str] | None = None
         self._pdf_index: int = -1
+        self._pdf_pending: Iterator[str] | None = None  # playlist entries not pulled yet
 
         # --- Inline length entry (HUD) ---
         self._length_input_active: bool = False
@@ -619,6 +717,7 @@ class UIApp(QtWidgets.QMainWindow):
 
         # Keep latest analysis (optional)
         self._last_analysis = None
+        self._analyzer: Optional[PageAnalyzer] = None  # open handle on the current PDF
         # --- Inline Indoor/Outdoor chooser ---
         self._io_choice_active: bool = False
         self._io_current: str = "Indoor"        # default preselection
@@ -699,7 +798,6 @@ class UIApp(QtWidgets.QMainWindow):
     # add near other helpers in UIApp
     def _apply_dimensions_to_meta(self, analysis):
         """Copy detected dimensions into state.meta so Exporter picks them up."""
-        from types import SimpleNamespace
         st = self.store.state
         meta = getattr(st, "meta", None) or SimpleNamespace()
 
@@ -717,14 +815,33 @@ class UIApp(QtWidgets.QMainWindow):
         setattr(meta, "cabinet_width",    grab("cabinet_width"))
 
         st.meta = meta
+        self.store.touch()
 
-    def load_pdf_list(self, paths: list[str]):
-        """Set a list of PDFs to process; open the first."""
-        paths = [p for p in paths if isinstance(p, str)]
-        self._pdf_list = paths if paths else None
+    def load_pdf_list(self, paths: Iterable[str]):
+        """Set the PDFs to process (any iterable, pulled lazily as the user advances); open the first."""
+        self._pdf_pending = (p for p in paths if isinstance(p, str))
+        self._pdf_list = []
         self._pdf_index = -1
-        if self._pdf_list:
+        if self._pdf_fill(0):
             self._open_next_pdf(initial=True)
+        else:
+            self._pdf_list = None
+
+    def _pdf_fill(self, index: int) -> bool:
+        """Pull playlist entries until `index` exists; False if the playlist is shorter."""
+        if self._pdf_list is None:
+            return False
+        while len(self._pdf_list) <= index and self._pdf_pending is not None:
+            path = next(self._pdf_pending, None)
+            if path is None:
+                self._pdf_pending = None
+            else:
+                self._pdf_list.append(path)
+        return index < len(self._pdf_list)
+
+    def _pdf_position(self) -> str:
+        total = len(self._pdf_list or ())
+        return f"PDF {self._pdf_index + 1}/{total}" + ("+" if self._pdf_pending is not None else "")
 
     def _open_next_pdf(self, initial: bool = False):
         if not self._pdf_list:
@@ -738,12 +855,12 @@ class UIApp(QtWidgets.QMainWindow):
                 self.toast("Finish current field before switching PDF", ttl=1.5)
                 return
             self._pdf_index += 1
-        if self._pdf_index >= len(self._pdf_list):
+        if not self._pdf_fill(self._pdf_index):
             self._pdf_index = len(self._pdf_list) - 1
             self.toast("Reached last PDF", ttl=1.2)
             return
         self._load_pdf_path(self._pdf_list[self._pdf_index])
-        self.toast(f"PDF {self._pdf_index + 1}/{len(self._pdf_list)}", ttl=0.8)
+        self.toast(self._pdf_position(), ttl=0.8)
 
     def _update_header(self):
         path = getattr(self.store.state.pdf, "path", None)
@@ -796,7 +913,7 @@ class UIApp(QtWidgets.QMainWindow):
 
         self._pdf_index -= 1
         self._load_pdf_path(self._pdf_list[self._pdf_index])
-        self.toast(f"PDF {self._pdf_index + 1}/{len(self._pdf_list)}", ttl=0.8)
+        self.toast(self._pdf_position(), ttl=0.8)
 
 
     def _load_pdf_path(self, path: str):
@@ -830,11 +947,7 @@ class UIApp(QtWidgets.QMainWindow):
             self._refresh_hud()
 
             # Analyze current page and draw dimension boxes
-            analysis = analyze_page(
-                pdf_path=path,
-                page_index=self.store.state.pdf.page,
-                dpi=150,
-            )
+            analysis = self._analyze(path, self.store.state.pdf.page)
 
             self._last_analysis = analysis
             self._apply_dimensions_to_meta(analysis)
@@ -843,9 +956,8 @@ class UIApp(QtWidgets.QMainWindow):
             rects_pt = [d.bbox_pt for d in (analysis.dimensions or [])]
             kinds    = [d.kind    for d in (analysis.dimensions or [])]
             if hasattr(self.canvas, "set_dimension_rects"):
-                self.canvas.set_dimension_rects(rects_pt, kinds)
+                self.canvas.set_dimension_rects(rects_pt, kinds)  # repaints the canvas
 
-            self.canvas.update()
             self._update_header()
 
 
@@ -854,6 +966,14 @@ class UIApp(QtWidgets.QMainWindow):
 
 
 
+    def _analyze(self, path: str, page_index: int):
+        """Dimension analysis through one PDF handle per file (reopened when the file changes)."""
+        if self._analyzer is None or self._analyzer.pdf_path != path:
+            if self._analyzer is not None:
+                self._analyzer.close()
+            self._analyzer = PageAnalyzer(path)
+        return self._analyzer.analyze(page_index, dpi=150)
+
     def _update_dimension_overlays(self):
         """Analyze the current page and paint dimension boxes on the canvas."""
         try:
@@ -863,11 +983,7 @@ class UIApp(QtWidgets.QMainWindow):
                 self.canvas.set_dimension_rects([])
                 return
 
-            analysis = analyze_page(
-                pdf_path=path,
-                page_index=page_index,
-                dpi=150,
-            )
+            analysis = self._analyze(path, page_index)
 
             self._apply_dimensions_to_meta(analysis)
             self._last_analysis = analysis
@@ -881,12 +997,12 @@ class UIApp(QtWidgets.QMainWindow):
             self.toast(f"Analyzer: {e}", ttl=2.0)
 
     def _set_indoor_outdoor(self, value: str):
-        from types import SimpleNamespace
         st = self.store.state
         meta = getattr(st, "meta", None) or SimpleNamespace()
         meta.indoor_outdoor = value  # "Indoor" | "Outdoor"
         st.meta = meta
         st.dirty = True
+        self.store.touch()
         self.toast(f"Unit location: {value}", ttl=1.2)
 
 
@@ -894,9 +1010,8 @@ class UIApp(QtWidgets.QMainWindow):
     @staticmethod
     def _fold(s: str) -> str:
         """lower + strip diacritics for prefix comparison."""
-        import unicodedata as _ud
-        s = _ud.normalize("NFD", s)
-        s = "".join(c for c in s if _ud.category(c) != "Mn")
+        s = unicodedata.normalize("NFD", s)
+        s = "".join(c for c in s if unicodedata.category(c) != "Mn")
         return s.casefold()
 
     def _active_enum_labels(self) -> list[str]:
@@ -1000,15 +1115,31 @@ class UIApp(QtWidgets.QMainWindow):
     # ------------- Toasts -------------
 
     def toast(self, msg: str, ttl: float = 2.0):
-        self._toasts.append((msg, time.time() + ttl))
+        self._toast_msgs.append(msg)
+        self._toast_expiry.append(time.time() + ttl)
+        if not self._toast_timer.isActive():
+            self._toast_timer.start()
         self._refresh_hud()
 
     def _prune_toasts(self):
         now = time.time()
-        old_len = len(self._toasts)
-        self._toasts = [(m, t) for (m, t) in self._toasts if t > now]
-        if len(self._toasts) != old_len:
+        msgs, expiry = self._toast_msgs, self._toast_expiry
+        changed = False
+        # toasts mostly expire oldest-first: drop from the head, no allocation when none expired
+        while expiry and expiry[0] <= now:
+            msgs.popleft()
+            expiry.popleft()
+            changed = True
+        # a shorter-lived toast queued behind a longer one
+        if expiry and min(expiry) <= now:
+            live = [i for i, t in enumerate(expiry) if t > now]
+            self._toast_msgs = deque(msgs[i] for i in live)
+            self._toast_expiry = deque(expiry[i] for i in live)
+            changed = True
+        if changed:
             self._refresh_hud()
+        if not self._toast_expiry:
+            self._toast_timer.stop()  # idle until the next toast()
 
     # ------------- Save -------------
 
@@ -1046,6 +1177,7 @@ class UIApp(QtWidgets.QMainWindow):
             if key in (Qt.Key_Return, Qt.Key_Enter):
                 self._ensure_meta()
                 self.store.state.meta.indoor_outdoor = self._io_current
+                self.store.touch()
                 self._io_choice_active = False
                 self.toast(f"Installation: {self._io_current}", ttl=1.2)
                 self._refresh_hud()
@@ -1160,20 +1292,18 @@ class UIApp(QtWidgets.QMainWindow):
 
 
         elif kind == Action.TOKEN_APPEND:
-            ch = str(pay)
             if self._token_buffer is None:
-                self._token_buffer = ch
-            else:
-                self._token_buffer += ch
+                self._token_buffer = []
+            self._token_buffer.extend(str(pay))  # one entry per character
 
         elif kind == Action.TOKEN_BACKSPACE:
             if self._token_buffer:
-                self._token_buffer = self._token_buffer[:-1]
+                self._token_buffer.pop()
                 if not self._token_buffer:
                     self._token_buffer = None
 
         elif kind == Action.TOKEN_SUBMIT:
-            tok = (self._token_buffer or "").strip()
+            tok = "".join(self._token_buffer or ()).strip()
             if not tok:
                 return
             try:
@@ -1235,22 +1365,19 @@ class UIApp(QtWidgets.QMainWindow):
             delta = int(pay)
             self.store.apply(NavPage(delta))
             self.pdf.nav(delta)
-            self.canvas.update()
             page = self.store.state.pdf.page + 1
             total = max(1, self.store.state.pdf.page_count)
             self.toast(f"Page {page}/{total}", ttl=0.8)
 
-            # Update overlays
+            # Update overlays (the canvas repaints with the HUD refresh below)
             self._update_dimension_overlays()
-            self.canvas.update()
             self._update_header()
 
 
         elif kind == Action.SET_ZOOM:
             zoom = float(pay)
             self.store.apply(SetZoom(zoom))
-            self.pdf.set_zoom(self.store.state.pdf.zoom)  # keep manual zoom
-            self.canvas.update()                          # repaint only (no fit_to_frame)
+            self.pdf.set_zoom(self.store.state.pdf.zoom)  # keep manual zoom; no fit_to_frame
             self.toast(f"Zoom {int(self.store.state.pdf.zoom*100)}%", ttl=0.8)
 
 
@@ -1265,12 +1392,10 @@ class UIApp(QtWidgets.QMainWindow):
             self._fieldbuf_timer.stop()
 
         elif kind == Action.PREV_SECTION:
-            from state import PrevSection  # lazy import
             self.store.apply(PrevSection())
             self.toast(f"Section S{self.store.state.get_active_section().number}", ttl=0.8)
 
         elif kind == Action.NEXT_SECTION:
-            from state import NextSection
             self.store.apply(NextSection())
             self.toast(f"Section S{self.store.state.get_active_section().number}", ttl=0.8)
 
@@ -1292,7 +1417,6 @@ class UIApp(QtWidgets.QMainWindow):
             )
             if ans != QtWidgets.QMessageBox.Yes:
                 self._refresh_hud(); return
-            from state import ResetSection
             try:
                 self.store.apply(ResetSection(section_id=sec.id, clear_length=False))
                 self.toast(f"Section S{sec.number} cleared", ttl=1.2)
@@ -1344,8 +1468,33 @@ class UIApp(QtWidgets.QMainWindow):
     # ------------- HUD refresh -------------
 
     def _refresh_hud(self):
-        msgs = [m for (m, t) in self._toasts if t > time.time()]
-        model = self.prompts.build(self.store.state, self._token_buffer, msgs, field_buffer=self._field_buffer)
+        """Schedule a HUD rebuild; repeated calls before it runs coalesce into one."""
+        if not self._refresh_timer.isActive():
+            self._refresh_timer.start()
+
+    def _do_refresh_hud(self):
+        now = time.time()
+        expiry = self._toast_expiry
+        if not expiry or min(expiry) > now:
+            msgs = list(self._toast_msgs)  # nothing expired since the last prune
+        else:
+            msgs = [m for m, t in zip(self._toast_msgs, expiry) if t > now]
+
+        # Nothing the HUD (or the page under it) shows has changed: skip the rebuild + repaint.
+        # pdf fields are listed because the UI edits state.pdf in place.
+        store = self.store
+        pdf = store.state.pdf
+        key = (
+            store.revision, pdf.path, pdf.page, pdf.page_count, pdf.zoom,
+            tuple(self._token_buffer) if self._token_buffer is not None else None,
+            self._field_buffer, tuple(msgs),
+            self._length_input_active, self._length_buffer, self._io_choice_active, self._io_current,
+        )
+        if self._last_hud_key is not None and self._last_hud_key[0] is store and self._last_hud_key[1] == key:
+            return
+        self._last_hud_key = (store, key)
+
+        model = self.prompts.build(store.state, self._token_buffer, msgs, field_buffer=self._field_buffer)
 
         # Inline length HUD overlay
         if self._length_input_active:
@@ -1353,6 +1502,7 @@ class UIApp(QtWidgets.QMainWindow):
             secnum = sec.number if sec else "?"
             model.title = f"Section S{secnum} — enter length (inches)"
             model.hints = ["Type digits • Backspace to edit • Enter to confirm • Esc to skip"]
+            model.hints_display = model.hints[0]
             disp = self._length_buffer if self._length_buffer else ""
             model.token_ui = f"length: {disp}▎"
 
@@ -1360,12 +1510,14 @@ class UIApp(QtWidgets.QMainWindow):
         if self._io_choice_active:
             model.title = "Select unit location"
             model.hints = ["Press I for Indoor • O for Outdoor • Enter to confirm"]
+            model.hints_display = model.hints[0]
             model.token_ui = f"Indoor/Outdoor: [{self._io_current}] ▎"
 
         # Inline Indoor/Outdoor HUD overlay
         if self._io_choice_active:
             model.title = "Select installation type"
             model.hints = ["Use ←/→ or I / O to switch • Enter to confirm"]
+            model.hints_display = model.hints[0]
             model.fields = []  # no chips while choosing
             model.token_ui = f"installation: {self._io_current} ▎"
             # Visually highlight the current choice using the pill row
@@ -1388,6 +1540,7 @@ class UIApp(QtWidgets.QMainWindow):
         # Opening via dialog cancels any existing playlist and just opens this file
         self._pdf_list = [path]
         self._pdf_index = 0
+        self._pdf_pending = None
         self._load_pdf_path(path)
         self.toast("PDF loaded", ttl=1.0)
 
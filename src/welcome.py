@@ -4,6 +4,9 @@ from PySide6 import QtCore, QtGui, QtWidgets
 from pathlib import Path
 from typing import List, Optional, Tuple
 
+from app_support import scan_pdfs
+
+
 class WelcomeDialog(QtWidgets.QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -278,8 +281,5 @@ class WelcomeDialog(QtWidgets.QDialog):
         return (None, [])
 
     def _gather_pdfs(self, folder: Path, *, recursive: bool) -> List[Path]:
-        if recursive:
-            return sorted((p for p in folder.rglob("*.pdf") if p.is_file()),
-                          key=lambda x: x.as_posix().lower())
-        return sorted((p for p in folder.iterdir() if p.is_file() and p.suffix.lower() == ".pdf"),
-                      key=lambda x: x.as_posix().lower())
+        # same scan (and order) as a CLI folder target
+        return [Path(p) for p in scan_pdfs(folder, recursive)]
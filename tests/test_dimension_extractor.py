@@ -0,0 +1,139 @@
+import random
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pdfplumber")
+import dimension_extractor as de  # noqa: E402
+
+
+# ---------- white band ----------
+
+def _ref_band(gray, lower_frac, upper_frac, min_height_px, max_height_frac, thr, col_stride=1):
+    """Plain-Python _find_white_band_px: earliest run reaching the cap, else first longest run."""
+    H, W = gray.shape
+    y0, y1 = int(H * lower_frac), int(H * upper_frac)
+    if y1 <= y0:
+        return None
+    runs, cur = [], None
+    for y in range(y0, y1):
+        if all(gray[y, x] >= thr for x in range(0, W, max(1, col_stride))):
+            if cur is None:
+                cur = [y, 0]
+                runs.append(cur)
+            cur[1] += 1
+        else:
+            cur = None
+    max_len = int(H * max_height_frac)
+    stop_len = max(max_len, min_height_px) if max_len > 0 else 0
+    capped = [r for r in runs if stop_len and r[1] >= stop_len]
+    if capped:
+        start, length = capped[0]
+    elif runs:
+        start, length = max(runs, key=lambda r: r[1])  # max() keeps the first of equal runs
+    else:
+        return None
+    if length < min_height_px:
+        return None
+    return (start, start + min(length, max_len))
+
+
+def _random_page(rng, H=120, W=40):
+    gray = np.full((H, W), 255, dtype=np.uint8)
+    for y in range(H):
+        if rng.random() < 0.3:
+            # sparse ink: sometimes a single pixel a column stride can step over
+            xs = [rng.randrange(W)] if rng.random() < 0.5 else range(rng.randrange(W), W)
+            for x in xs:
+                gray[y, x] = rng.randrange(0, 250)
+    return gray
+
+
+@pytest.mark.parametrize("use_numba_path", [False, True])
+def test_find_white_band_matches_reference(monkeypatch, use_numba_path):
+    # with numba missing, _band_scan is the plain-Python kernel: both dispatch paths still run
+    monkeypatch.setattr(de, "_HAS_NUMBA", use_numba_path)
+    rng = random.Random(7)
+    for _ in range(400):
+        gray = _random_page(rng)
+        args = (
+            rng.choice([0.0, 0.2]),
+            rng.choice([0.8, 1.0]),
+            rng.choice([1, 3, 8]),
+            rng.choice([0.0, 0.02, 0.05, 0.15, 1.0]),  # 0 = no cap
+            rng.choice([200, 255]),
+            rng.choice([1, 2, 3]),
+        )
+        assert de._find_white_band_px(gray, *args) == _ref_band(gray, *args), args
+
+
+def test_find_white_band_edge_cases():
+    gray = np.full((100, 10), 255, dtype=np.uint8)
+    assert de._find_white_band_px(gray, 0.5, 0.5, 1, 0.15, 255) is None  # empty window
+    assert de._find_white_band_px(gray, 0.2, 0.8, 1, 0.15, 255) == (20, 35)
+    assert de._find_white_band_px(gray, 0.2, 0.8, 1, 0.0, 255) == (20, 20)
+    gray[::2, 1::2] = 0  # every other column inked on even rows
+    assert de._find_white_band_px(gray, 0.0, 1.0, 2, 1.0, 255) is None
+    assert de._find_white_band_px(gray, 0.0, 1.0, 2, 1.0, 255, col_stride=2) == (0, 100)
+
+
+def test_band_scan_numba_matches_numpy():
+    pytest.importorskip("numba")
+    assert de._HAS_NUMBA
+    rng = random.Random(11)
+    for _ in range(300):
+        gray = _random_page(rng)
+        y0 = rng.randrange(0, 60)
+        args = (y0, rng.randrange(y0, 121), rng.choice([200, 255]), rng.choice([1, 2, 3]),
+                rng.choice([0, 1, 5, 12]))
+        assert de._band_scan(gray, *args) == de._band_scan_numpy(gray, *args), args
+
+
+# ---------- token classification ----------
+
+def _ref_dims(boxes, band, dpi=150):
+    """Plain-Python classifier over (x0, top, x1, bottom, text) boxes -> {kind: text}."""
+    cy = lambda b: (b[1] + b[3]) / 2.0
+    cx = lambda b: (b[0] + b[2]) / 2.0
+    if band:
+        above = [b for b in boxes if cy(b) < band.y_top_pt]
+        below = [b for b in boxes if cy(b) > band.y_bottom_pt]
+    else:
+        above, below = [], list(boxes)
+    dims = {}
+    if below:
+        left_x = min(b[0] for b in below)
+        group = sorted((b for b in below if abs(b[0] - left_x) <= 2.0), key=lambda b: b[1])
+        dims["cabinet_height"] = group[0][4]
+        if len(group) >= 2:
+            dims["height_base_only"] = group[1][4]
+    if above:
+        tol_pt = 2.0 / (dpi / 72.0)
+        groups, prev = [], None
+        for b in sorted(above, key=cx):
+            if prev is None or cx(b) - prev > tol_pt:
+                groups.append([])
+            groups[-1].append(b)
+            prev = cx(b)
+        wwb = min(groups[0], key=lambda b: (b[0], b[1]))
+        dims["width_with_base"] = wwb[4]
+        if len(groups) >= 2:
+            dims["cabinet_width"] = min(groups[1], key=lambda b: abs(cy(b) - cy(wwb)))[4]
+    return dims
+
+
+def test_token_classification_matches_reference():
+    rng = random.Random(3)
+    H = 100
+    for _ in range(300):
+        boxes = []
+        for i in range(rng.randrange(0, 12)):
+            x0, top = float(rng.randrange(0, 30)), float(rng.randrange(0, H - 4))  # coarse grid: ties
+            boxes.append((x0, top, x0 + rng.choice([3.0, 6.0]), top + 4.0, str(100 + i)))
+        gray = np.full((H, 10), 255, dtype=np.uint8)
+        gray[rng.randrange(H)::rng.randrange(1, 50)] = 0
+        coords = np.array([b[:4] for b in boxes], dtype=np.float64).reshape(-1, 4)
+        tokens = de._Tokens(coords, tuple(b[4] for b in boxes))
+        res = de._analyze_loaded((tokens, (gray, 1.0, H)), band_dpi=72, min_band_height_px=10)
+        got = {d.kind: d.text_raw for d in res.dimensions}
+        assert got == _ref_dims(boxes, res.white_band), boxes
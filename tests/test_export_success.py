@@ -1,6 +1,12 @@
 # tests/test_export_success.py
 import json
+import math
+
+import pytest
+
+import export
 from export import Exporter
+from registry.normalize import normalize_number
 from state import (
     NewSection, StartComponent, SetFieldValue, NextField,
     NavPage, SetSectionLength
@@ -63,3 +69,58 @@ def test_export_success_minimal_flow(store, registry, tmp_path):
     out_path.write_text(xp.dumps(data, pretty=True), encoding="utf-8")
     loaded = json.loads(out_path.read_text(encoding="utf-8"))
     assert loaded["Unit Properties"]["Unit size"]["Section quantity"] == 2
+
+
+def test_dump_stream_matches_dumps(store, registry, tmp_path):
+    store.apply(NewSection(name="S1", length=64))
+    xp = Exporter(registry)
+    data = xp.build(store.state)
+
+    for pretty in (True, False):
+        out_path = tmp_path / f"stream_{pretty}.json"
+        with open(out_path, "wb") as fp:
+            xp.dump(fp, data, pretty=pretty)
+        assert out_path.read_text(encoding="utf-8") == xp.dumps(data, pretty=pretty)
+        assert out_path.read_bytes() == xp.dumpb(data, pretty=pretty)
+
+        by_path = tmp_path / f"path_{pretty}.json"
+        xp.dump(by_path, data, pretty=pretty)
+        assert by_path.read_bytes() == out_path.read_bytes()
+
+
+def test_orjson_and_stdlib_backends_agree(store, registry, monkeypatch):
+    pytest.importorskip("orjson")
+    store.apply(NewSection(name="Zuluft Ø", length=64))
+    store.apply(StartComponent(token="gas"))
+    store.apply(SetFieldValue("L"))
+    store.apply(NextField())
+    store.apply(SetFieldValue("2"))
+    store.apply(NextField())
+    store.apply(NewSection(name="S2", length=None))
+    xp = Exporter(registry)
+    data = xp.build(store.state)
+    data["Unit Properties"]["Unit size"]["Width (with base)"] = 12.5
+
+    out = {}
+    for has_orjson in (True, False):
+        monkeypatch.setattr(export, "_HAS_ORJSON", has_orjson)
+        out[has_orjson] = [xp.dumpb(data, pretty=p) for p in (True, False)]
+    assert out[True] == out[False]
+
+
+def test_non_finite_numbers_are_rejected(store, registry, monkeypatch):
+    for bad in (float("nan"), float("inf"), "-inf"):
+        ok, _, err = normalize_number(bad)
+        assert not ok and err
+    assert normalize_number("1e3") == (True, 1000.0, None)
+
+    store.apply(NewSection(name="S1", length=64))
+    sec = store.state.sections[0]
+    with pytest.raises(ValueError):
+        store.apply(SetSectionLength(section_id=sec.id, length=math.nan))
+    assert store.state.sections[0].length == 64
+
+    # anything non-finite that still reaches the stdlib encoder fails instead of writing invalid JSON
+    monkeypatch.setattr(export, "_HAS_ORJSON", False)
+    with pytest.raises(ValueError):
+        Exporter(registry).dumps({"x": math.inf})
@@ -0,0 +1,83 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("fitz")
+pytest.importorskip("PySide6")
+import pdfio  # noqa: E402
+from pdfio import _RenderCache  # noqa: E402
+
+PREFETCH = (-1, 1, 2)
+
+
+def _turn_pages(cache, pages, scale=1.5, dpr=1.0):
+    """Sequential page turns the way PdfIO drives the cache: show page, then prefetch neighbours."""
+    hits = 0
+    for page in range(pages):
+        key = (page, scale, dpr)
+        if cache.get(key) is not None:
+            hits += 1
+        else:
+            cache.put(key, object())
+        for d in PREFETCH:
+            nkey = (page + d, scale, dpr)
+            if page + d >= 0 and nkey not in cache:
+                cache.put(nkey, object(), admit=True)
+    return hits
+
+
+def test_prefetched_pages_hit_past_cache_capacity():
+    cache = _RenderCache(capacity=12)
+    hits = _turn_pages(cache, 200)
+    assert hits == 199  # only the very first page is rendered on demand
+
+
+def test_one_off_renders_do_not_flush_viewed_pages():
+    cache = _RenderCache(capacity=4)
+    viewed = [(p, 1.0, 1.0) for p in range(4)]
+    for key in viewed:
+        for _ in range(3):
+            if cache.get(key) is None:
+                cache.put(key, object())
+    # a resize drag: many scales seen once each
+    for i in range(20):
+        key = (0, 1.0 + i / 100, 1.0)
+        cache.get(key)
+        cache.put(key, object())
+    assert all(key in cache for key in viewed)
+
+
+class _FakeDoc:
+    opened = []
+
+    def __init__(self, path):
+        self.closed = False
+        _FakeDoc.opened.append(self)
+
+    def load_page(self, i):
+        pix = SimpleNamespace(width=2, height=1, stride=6, samples=bytes(6))
+        return SimpleNamespace(get_pixmap=lambda matrix, alpha: pix)
+
+    def close(self):
+        self.closed = True
+
+
+def test_worker_reopens_a_file_changed_on_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdfio.fitz, "open", _FakeDoc)
+    monkeypatch.setattr(pdfio, "_worker_doc", None)
+    _FakeDoc.opened.clear()
+    pdf = tmp_path / "a.pdf"
+    pdf.write_bytes(b"v1")
+    v1 = pdfio._mtime_ns(str(pdf))
+    pdfio._render_pixels(str(pdf), v1, 0, 1.0)
+    pdfio._render_pixels(str(pdf), v1, 1, 1.0)
+    assert len(_FakeDoc.opened) == 1  # kept open across calls
+
+    os.utime(pdf, ns=(v1 + 10**9, v1 + 10**9))  # rewritten, then reopened by the parent
+    v2 = pdfio._mtime_ns(str(pdf))
+    pdfio._render_pixels(str(pdf), v2, 0, 1.0)
+    assert len(_FakeDoc.opened) == 2 and _FakeDoc.opened[0].closed
+    with pytest.raises(RuntimeError):  # a late task for the old version: never render it from v2
+        pdfio._render_pixels(str(pdf), v1, 0, 1.0)
+    assert _FakeDoc.opened[1].closed and len(_FakeDoc.opened) == 2
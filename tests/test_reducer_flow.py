@@ -2,7 +2,7 @@ import pytest
 from state import (
     AppState, Mode,
     NewSection, StartComponent, SetFieldValue, NextField, PrevField,
-    CommitComponent,
+    CommitComponent, RenameSection, NavPage, SetZoom, NextSection,
 )
 from state import reduce
 
@@ -64,3 +64,67 @@ def test_commit_rejects_when_required_missing(registry):
     # try to commit without setting stack_qty (required)
     with pytest.raises(ValueError):
         s = reduce(s, CommitComponent(), registry)
+
+
+def test_reduce_shares_untouched_state(registry):
+    s = AppState()
+    s = reduce(s, NewSection(name="A", length=10), registry)
+    s = reduce(s, NewSection(name="B", length=20), registry)
+    first, second = s.sections
+
+    s2 = reduce(s, RenameSection(second.id, "B2"), registry)
+    # input untouched; only the renamed section is rebuilt
+    assert s.sections[1].name == "B"
+    assert s2.sections[1].name == "B2"
+    assert s2.sections[0] is first
+    assert s2.pdf is s.pdf
+
+
+def test_reduce_noop_returns_same_state(registry):
+    s = AppState()
+    s.pdf.page_count = 3
+    s = reduce(s, NewSection(name="A", length=10), registry)
+    # clamped at the first page / same zoom / last section: nothing to rebuild
+    assert reduce(s, NavPage(-1), registry) is s
+    assert reduce(s, SetZoom(1.0), registry) is s
+    assert reduce(s, NextSection(), registry) is s
+
+    zoomed = reduce(s, SetZoom(9.0), registry)
+    assert zoomed.pdf.zoom == 4.0
+    assert reduce(zoomed, SetZoom(5.0), registry) is zoomed
+
+    editing = reduce(s, StartComponent(token="gas"), registry)
+    assert reduce(editing, PrevField(), registry) is editing
+
+
+def test_new_ids_are_unique_within_a_millisecond(registry):
+    s = AppState()
+    a = reduce(s, NewSection(name="A", length=10), registry)
+    b = reduce(s, NewSection(name="A", length=10), registry)  # same position, same instant
+    assert a.sections[0].number == b.sections[0].number
+    assert a.sections[0].id != b.sections[0].id
+
+
+def _sample_input(fdef):
+    ftype = fdef.get("type", "enum")
+    if ftype == "enum":
+        return next(iter(fdef["map"]))
+    if ftype == "bool":
+        return "y"
+    return str(fdef.get("min") or 1)  # int / number
+
+
+def test_committed_fields_are_scalars(registry):
+    # _commit_current_draft copies draft values shallowly: that relies on SetFieldValue
+    # storing normalized scalars only, for every field type
+    for type_id, spec in registry.all_specs().items():
+        s = reduce(AppState(), NewSection(name="S1", length=10), registry)
+        s = reduce(s, StartComponent(token=type_id), registry)
+        for fname in spec["field_sequence"]:
+            s = reduce(s, SetFieldValue(_sample_input(spec["fields"][fname])), registry)
+            s = reduce(s, NextField(), registry)
+        assert s.mode == Mode.SECTION_ACTIVE, type_id
+        comp = s.get_active_section().components[0]
+        assert set(comp.fields) == set(spec["field_sequence"]), type_id
+        for fname, v in comp.fields.items():
+            assert v is not None and isinstance(v, (str, int, float, bool)), (type_id, fname, v)
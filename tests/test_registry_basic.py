@@ -1,3 +1,7 @@
+import copy
+import pickle
+
+import pytest
 from registry import PluginRegistry
 
 
@@ -28,6 +32,12 @@ def test_normalization_enum_bool_int(registry):
     ok, val, err = registry.validate_value("ECM", "mounting_location", "Left")
     assert ok and val == "Left"
 
+    ok, val, err = registry.validate_value("ECM", "mounting_location", " RIGHT ")
+    assert ok and val == "Right"
+
+    ok, val, err = registry.validate_value("ECM", "mounting_location", "up")
+    assert not ok and "Invalid value" in err
+
     # bool: ECM backdraft_dampers
     ok, val, err = registry.validate_value("ECM", "backdraft_dampers", "y")
     assert ok and val == "Yes"
@@ -39,5 +49,46 @@ def test_normalization_enum_bool_int(registry):
     ok, val, err = registry.validate_value("Misc", "lights_qty", "9")
     assert ok and val == 9
 
+    ok, val, err = registry.validate_value("Misc", "lights_qty", 4)
+    assert ok and val == 4
+
+    ok, val, err = registry.validate_value("Misc", "lights_qty", "four")
+    assert not ok and "Expected integer" in err
+
     ok, val, err = registry.validate_value("PlateHEX", "stack_qty", "0")
     assert not ok and "Minimum" in err  # min=1
+
+
+def test_add_aliases_from_config():
+    reg = PluginRegistry()
+    # target may be a type_id or an existing token
+    reg.add_aliases({"heater": "GasHeater", "ahu_fans": "ec"})
+    assert reg.resolve_token("Heater") == "GasHeater"
+    assert reg.resolve_token("ahu_fans") == "ECM"
+    assert "heater" in reg.get_spec("GasHeater")["aliases"]
+
+    # a fresh registry is unaffected (built-in alias lists are not mutated)
+    assert PluginRegistry().resolve_token("heater") is None
+
+    # unknown targets raise, but valid entries are still applied
+    with pytest.raises(ValueError, match="NoSuchType"):
+        reg.add_aliases({"hx": "NoSuchType", "wheelie": "WheelHEX"})
+    assert reg.resolve_token("wheelie") == "WheelHEX"
+
+
+def test_specs_are_plain_declared_data():
+    reg = PluginRegistry(extra_specs={
+        "ECM": {"label": "EC Fans", "field_sequence": ["qty"], "fields": {"qty": {"type": "int", "min": 1}}},
+    })
+    specs = reg.all_specs()
+    assert pickle.loads(pickle.dumps(specs)) == copy.deepcopy(specs) == specs
+    for tid, spec in specs.items():
+        assert not any(k.startswith("_") for k in spec), tid
+        for fdef in spec["fields"].values():
+            assert type(fdef) is dict and not any(k.startswith("_") for k in fdef), tid
+
+    # an override replaces the built-in's fields and their validators
+    assert reg.validate_value("ECM", "qty", "0")[2] == "Minimum is 1"
+    assert reg.validate_value("ECM", "mounting_location", "r")[2] == "Unknown field for ECM: mounting_location"
+    assert reg.validate_value("Nope", "qty", "1")[2] == "Unknown component type: Nope"
+    assert reg.resolve_token("ec fans") == "ECM"
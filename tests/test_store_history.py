@@ -1,5 +1,5 @@
 from state import Store
-from state import NewSection, StartComponent, SetFieldValue, NextField
+from state import NewSection, StartComponent, SetFieldValue, NextField, NavPage, SetZoom
 
 
 def test_store_apply_undo_redo(registry):
@@ -19,3 +19,74 @@ def test_store_apply_undo_redo(registry):
 
     store.redo()
     assert len(store.state.sections[0].components) == 1
+
+
+def test_store_history_keeps_states_by_reference(registry):
+    store = Store(registry=registry)
+    before = store.state
+    after = store.apply(NewSection(name="S1", length=64))
+
+    assert before.sections == []  # reduce left the snapshot untouched
+    assert store.undo() is before
+    assert store.redo() is after
+
+
+def test_store_revision_tracks_changes(registry):
+    store = Store(registry=registry)
+    assert store.revision == 0
+
+    store.apply(NewSection(name="S1", length=64))
+    assert store.revision == 1
+
+    store.undo()
+    store.redo()
+    assert store.revision == 3
+
+    store.touch()
+    assert store.revision == 4
+
+
+def test_store_history_is_bounded(registry):
+    store = Store(registry=registry, max_history=2)
+    for i in range(4):
+        store.apply(NewSection(name=f"S{i}", length=10))
+
+    store.undo()
+    store.undo()
+    assert len(store.state.sections) == 2
+    store.undo()  # older states were dropped
+    assert len(store.state.sections) == 2
+
+
+def test_store_noop_commands_leave_history_alone(store):
+    store.apply(NewSection(name="S1", length=64))
+    undo_depth, rev = len(store._undo), store.revision
+
+    store.apply(NavPage(-1))  # already on the first page
+    store.apply(SetZoom(store.state.pdf.zoom))
+    assert store.revision == rev
+    assert len(store._undo) == undo_depth
+    assert store.state is not store._undo[-1]  # in-place UI edits can't reach a snapshot
+
+    store.undo()
+    assert store.state.sections == []  # one undo reverts the real change
+
+
+def test_store_data_revision_ignores_view_changes(store):
+    store.apply(NewSection(name="S1", length=64))
+    data_rev = store.data_revision
+
+    store.apply(NavPage(1))
+    store.apply(SetZoom(2.0))
+    store.undo()  # back to the old zoom: still no data change
+    assert store.revision > data_rev and store.data_revision == data_rev
+
+    store.apply(StartComponent(token="gas"))  # opens a draft: sections untouched
+    assert store.data_revision == data_rev
+    store.undo()
+    store.undo()
+    store.undo()  # NewSection
+    assert store.data_revision == data_rev + 1
+
+    store.touch()  # in-place meta edit
+    assert store.data_revision == data_rev + 2